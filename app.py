@@ -1,21 +1,17 @@
 import os
-import tempfile
-import numpy as np
-import gradio as gr
 import logging
-from typing import Dict, Any
-import subprocess
 import time
 import threading
-import queue
-import librosa
 
 current_file_path = os.path.abspath(__file__)
 current_directory = os.path.dirname(current_file_path)
 os.chdir(current_directory)
 print(f"📁 Server running from: {current_directory}")
 
-from model import LowLatencyTranslator, warm_up_models
+from model import LowLatencyTranslator
+from audio_io import FFmpegAudioStream, load_audio
+from pipeline import TranslationPipeline
+from workers import WORKERS, WorkerPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,37 +20,109 @@ logger = logging.getLogger(__name__)
 class GlobalTranslator:
     _instance = None
     _lock = threading.Lock()
+    # "not started" → "loading" → "ready" (or "failed"), reported by /readyz
+    state = "not started"
+    error = None
+    worker_pool = None
     
     @classmethod
     def get_instance(cls):
+        """The shared models; blocks while they are still loading.
+
+        A failed load is not retried on every request; restart the server instead.
+        """
         if cls._instance is None:
             with cls._lock:
+                if cls.state == "failed":
+                    raise RuntimeError(f"Model loading failed: {cls.error}")
                 if cls._instance is None:
-                    print("🚀 LOADING MODELS (First time only)...")
-                    cls._instance = LowLatencyTranslator()
-                    warm_up_models(
-                        cls._instance.asr_model,
-                        cls._instance.asr_processor,
-                        cls._instance.translator.model,
-                        cls._instance.translator.tokenizer
-                    )
-                    print("✅ MODELS LOADED!")
+                    cls._load()
         return cls._instance
 
-global_translator = GlobalTranslator.get_instance()
+    @classmethod
+    def _load(cls):
+        cls.state = "loading"
+        print("🚀 LOADING MODELS (First time only)...")
+        try:
+            # Loads and warms every model once. Workers share the parent's weights
+            # copy-on-write, but a model they load lazily would be a private copy in
+            # each of them, so with workers every Whisper model is preloaded
+            instance = LowLatencyTranslator(preload_models="all") if WORKERS > 0 else LowLatencyTranslator()
+            # Optional inference worker processes, forked now that the models are loaded
+            if WORKERS > 0:
+                # Forking while a background load holds a model's lock would leave
+                # that lock held forever in every child, so let all loads finish first
+                instance.wait_until_loaded()
+                if instance.load_errors:
+                    raise RuntimeError(f"model loading failed: {instance.load_errors}")
+                try:
+                    cls.worker_pool = WorkerPool(instance, WORKERS)
+                except Exception as e:
+                    print(f"⚠️ Worker processes disabled, running inference in-process: {e}")
+        except Exception as e:
+            cls.state = "failed"
+            cls.error = str(e)
+            raise
+        cls._instance = instance
+        cls.state = "ready"
+        print("✅ MODELS LOADED!")
+
+    @classmethod
+    def start_background_load(cls):
+        """Load the models without blocking, so the server (and /healthz) comes up first"""
+        def load():
+            try:
+                cls.get_instance()
+            except Exception as e:
+                logger.error(f"Model loading failed: {e}")
+        threading.Thread(target=load, name="model-loader", daemon=True).start()
+
+if WORKERS > 0:
+    # Worker processes are forked from the loaded models before the server starts
+    GlobalTranslator.get_instance()
+else:
+    GlobalTranslator.start_background_load()
+
+# Concurrent requests Gradio runs per event; sessions share the models but not their state
+CONCURRENCY_LIMIT = int(os.environ.get("S2ST_CONCURRENCY", "4"))
+DEFAULT_SOURCE_LANG = "english"
+DEFAULT_TARGET_LANG = "hindi"
 
 class AudioProcessor:
-    def __init__(self, translator: LowLatencyTranslator):
-        self.translator = translator
-        # These will be reset per session
-        self.status = "connected"
-        self.current_source_lang = "english"
-        self.current_target_lang = "hindi"
-        self.last_tts_file = None
+    """Request handlers over the shared models.
+
+    Holds no per-user data: languages, status and results live in each
+    session's gr.State dict, so concurrent sessions never see each other's.
+    """
+
+    def __init__(self, translator: LowLatencyTranslator = None, worker_pool=None):
+        self._translator = translator
+        self._worker_pool = worker_pool
+        # Served-traffic counters for /readyz
+        self.active_requests = 0
+        self.last_latency_s = None
+        self.last_first_audio_s = None
+        self._stats_lock = threading.Lock()
+
+    @property
+    def translator(self):
+        # Waits for the background model load on the first requests after startup
+        return self._translator or GlobalTranslator.get_instance()
+
+    @property
+    def worker_pool(self):
+        if self._worker_pool is not None:
+            return self._worker_pool
+        # The pool is created together with the models
+        GlobalTranslator.get_instance()
+        return GlobalTranslator.worker_pool
 
     def get_session_state(self):
         """Get or create session state for current user"""
         return {
+            'status': "connected",
+            'source_lang': DEFAULT_SOURCE_LANG,
+            'target_lang': DEFAULT_TARGET_LANG,
             'current_transcription': "",
             'current_translation': "", 
             'last_update_time': 0,
@@ -62,31 +130,15 @@ class AudioProcessor:
             'max_history_items': 10
         }
 
-    def cleanup_previous_tts(self):
-        """Clean up only the previous TTS file"""
-        if self.last_tts_file and os.path.exists(self.last_tts_file):
-            try:
-                os.unlink(self.last_tts_file)
-                print(f"🧹 Cleaned up previous TTS file: {self.last_tts_file}")
-            except Exception as e:
-                print(f"⚠️ Could not cleanup TTS file: {e}")
-            finally:
-                self.last_tts_file = None
-
-    def change_languages(self, source_lang: str, target_lang: str):
-        """Change languages"""
+    def change_languages(self, state, source_lang: str, target_lang: str):
+        """Change languages for this session only"""
         try:
-            self.translator.source_lang = source_lang
-            self.translator.target_lang = target_lang
-            self.current_source_lang = source_lang
-            self.current_target_lang = target_lang
+            state['source_lang'] = source_lang
+            state['target_lang'] = target_lang
+            state['status'] = "connected"
             
             print(f"🌐 LANGUAGES CHANGED: {source_lang} → {target_lang}")
             
-            global_translator = GlobalTranslator.get_instance()
-            global_translator.source_lang = source_lang
-            global_translator.target_lang = target_lang
-            
             return f"✅ Languages changed to {source_lang.title()} → {target_lang.title()}", "connected"
             
         except Exception as e:
@@ -99,8 +151,8 @@ class AudioProcessor:
             'original': original,
             'translated': translated,
             'timestamp': time.strftime('%H:%M:%S'),
-            'source_lang': self.current_source_lang,
-            'target_lang': self.current_target_lang
+            'source_lang': state['source_lang'],
+            'target_lang': state['target_lang']
         }
         state['translation_history'].insert(0, history_item)
         
@@ -142,34 +194,86 @@ class AudioProcessor:
         history_html += "</div>"
         return history_html
 
-    def process_audio_file(self, state, file_path: str):
+    def iter_process_audio_file(self, state, file_path: str):
+        """Yields (state, message, status, audio chunk) as each segment completes"""
         try:
             if not file_path:
-                return state, "❌ Please select an audio file first.", "error", None
+                yield state, "❌ Please select an audio file first.", "error", None
+                return
     
-            print(f"🎵 PROCESSING AUDIO FILE: {self.translator.source_lang} → {self.translator.target_lang}")
-            self.status = "processing"
-    
-            # Clean up previous TTS
-            self.cleanup_previous_tts()
+            print(f"🎵 PROCESSING AUDIO FILE: {state['source_lang']} → {state['target_lang']}")
+            state['status'] = "processing"
     
             # Load audio file
-            audio, sr = librosa.load(file_path, sr=self.translator.sample_rate)
+            sr = self.translator.sample_rate
+            audio = load_audio(file_path, sample_rate=sr)
             duration = len(audio) / sr
             print(f"✅ Loaded audio file ({duration:.1f}s)")
             
-            # ✅ FIX: Use the actual selected source language
-            self.translator.source_lang = self.current_source_lang
-            forced_lang = self.current_source_lang
+            yield from self.iter_process_audio(state, [audio])
+    
+        except Exception as e:
+            logger.error(f"Audio file processing error: {e}")
+            state['status'] = "error"
+            yield state, f"❌ Error processing audio: {str(e)}", "error", None
+
+    def iter_process_audio(self, state, audio_chunks):
+        """ASR → translation → TTS for 16 kHz audio chunks (possibly still being extracted).
+
+        The stages overlap: each finished ASR window is translated and each
+        translated sentence is synthesized while later audio is still decoding.
+        Yields (state, message, status, audio chunk) after every completed step.
+        """
+        try:
+            # Languages come from the session, never from the shared translator
+            forced_lang = state['source_lang']
+            target_lang = state['target_lang']
+            # A new request must not show the previous one's results
+            state['current_transcription'] = ""
+            state['current_translation'] = ""
             print(f"🔊 FORCING ASR LANGUAGE: {forced_lang}")
+            if not self.translator.is_ready(forced_lang):
+                # English is served while whisper-medium is still loading in the background
+                yield state, f"⏳ The {forced_lang.title()} speech model is still loading, processing will start shortly...", "processing", None
+            
+            if self.worker_pool is not None:
+                pipeline = self.worker_pool.pipeline(forced_lang, target_lang)
+            else:
+                pipeline = TranslationPipeline(self.translator, forced_lang, target_lang)
+            transcripts, translations = [], []
+            first_audio = True
+            started = time.time()
+            yield state, "🔄 Translating... results appear as each segment completes", "processing", None
             
-            # Perform ASR
-            transcription = self.translator.speech_to_text(audio)
+            with self._stats_lock:
+                self.active_requests += 1
+            try:
+                for kind, value in pipeline.run(audio_chunks):
+                    audio_chunk = None
+                    if kind == 'transcript':
+                        transcripts.append(value)
+                        state['current_transcription'] = " ".join(transcripts)
+                    elif kind == 'translation':
+                        translations.append(value)
+                        state['current_translation'] = " ".join(translations)
+                    elif kind == 'audio':
+                        if first_audio:
+                            self.last_first_audio_s = time.time() - started
+                            print(f"⏱️ First translated audio after {self.last_first_audio_s:.1f}s")
+                            first_audio = False
+                        audio_chunk = value
+                    state['last_update_time'] = time.time()
+                    yield state, "🔄 Translating... results appear as each segment completes", "processing", audio_chunk
+            finally:
+                with self._stats_lock:
+                    self.active_requests -= 1
+            self.last_latency_s = time.time() - started
             
-            tts_file = None
+            transcription = " ".join(transcripts)
+            translated = " ".join(translations)
             
             if transcription and transcription.strip():
-                print(f"🎯 [{self.translator.source_lang}] File ASR: {transcription}")
+                print(f"🎯 [{forced_lang}] File ASR: {transcription}")
                 
                 # Check if we got proper Hindi script
                 if forced_lang == "hindi":
@@ -179,95 +283,100 @@ class AudioProcessor:
                     if not has_devanagari:
                         print("⚠️ WARNING: ASR output doesn't contain Hindi Devanagari script!")
                 
-                # Translation
-                translated = self.translator.translator.translate_text(
-                    transcription, 
-                    self.translator.source_lang, 
-                    self.translator.target_lang
-                )
-                print(f"🌐 [{self.translator.target_lang}] File Translation: {translated}")
-                
-                # Update session state
-                state['current_transcription'] = transcription
-                state['current_translation'] = translated
-                state['last_update_time'] = time.time()
-                
+                print(f"🌐 [{target_lang}] File Translation: {translated}")
                 self.add_to_history(state, transcription, translated)
-                
-                # TTS with cleanup
-                tts_file = self.translator.tts.text_to_speech(translated, self.translator.target_lang)
-                self.last_tts_file = tts_file
-                
-                # Ensure TTS file is accessible
-                if tts_file and os.path.exists(tts_file):
-                    print(f"🔊 TTS file generated: {tts_file}")
-                    # Convert to WAV if needed
-                    if not tts_file.endswith('.wav'):
-                        wav_file = tts_file.replace('.mp3', '.wav')
-                        command = [
-                            "ffmpeg", "-i", tts_file, "-ac", "1", "-ar", "22050",
-                            "-loglevel", "quiet", "-y", wav_file
-                        ]
-                        subprocess.run(command, check=True)
-                        if os.path.exists(wav_file):
-                            tts_file = wav_file
-                            self.last_tts_file = wav_file
-                else:
+                if first_audio:
                     print("❌ TTS file not generated properly")
-                    tts_file = None
             
             print("✅ Audio file processing completed")
-            self.status = "connected"
-            return state, "✅ Audio file processed successfully!", "connected", tts_file
+            state['status'] = "connected"
+            message = "✅ Audio file processed successfully!"
+            vad_stats = pipeline.vad_stats
+            if vad_stats and vad_stats['skipped_s'] >= 1.0:
+                message += f" (skipped {vad_stats['skipped_s']:.0f}s of silence)"
+            yield state, message, "connected", None
     
         except Exception as e:
             logger.error(f"Audio file processing error: {e}")
-            self.status = "error"
-            return state, f"❌ Error processing audio: {str(e)}", "error", None
+            state['status'] = "error"
+            yield state, f"❌ Error processing audio: {str(e)}", "error", None
 
-    def process_video_file(self, state, file_path: str):
+    def iter_process_video_file(self, state, file_path: str):
         """Process video file - WORKS ON HUGGING FACE (ffmpeg available)"""
         try:
             if not file_path:
-                return state, "❌ Please select a video file first.", "error", None
+                yield state, "❌ Please select a video file first.", "error", None
+                return
 
-            print(f"🎥 PROCESSING VIDEO FILE: {self.translator.source_lang} → {self.translator.target_lang}")
-            self.status = "processing"
+            print(f"🎥 PROCESSING VIDEO FILE: {state['source_lang']} → {state['target_lang']}")
+            state['status'] = "processing"
 
-            # Clean up previous TTS
-            self.cleanup_previous_tts()
-
-            # Extract audio from video
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as audio_tmp:
-                audio_path = audio_tmp.name
-            
-            command = [
-                "ffmpeg", "-i", file_path, "-ac", "1", "-ar", "16000", 
-                "-loglevel", "quiet", "-y", audio_path
-            ]
-            subprocess.run(command, check=True)
-            
-            print("✅ Video audio extracted")
-            
-            # Process the extracted audio and get TTS file
-            state, res_msg, status, tts_file = self.process_audio_file(state, audio_path)
+            # Extract audio through an ffmpeg pipe; ASR starts on the first chunks
+            # while the rest of the track is still being decoded
+            audio_stream = FFmpegAudioStream(file_path, sample_rate=self.translator.sample_rate).start()
             
-            # Cleanup
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
-            
-            self.status = "connected"
-            return state, "✅ Video file processed successfully!", "connected", tts_file
+            try:
+                # Process the extracted audio, passing partial results through
+                for state, res_msg, status, audio_chunk in self.iter_process_audio(state, audio_stream):
+                    if status == "error" and audio_stream.error is not None:
+                        raise audio_stream.error
+                    if status == "connected":
+                        print(f"✅ Video audio extracted ({audio_stream.length / audio_stream.sample_rate:.1f}s)")
+                        res_msg = res_msg.replace("Audio file", "Video file")
+                    yield state, res_msg, status, audio_chunk
+            finally:
+                # Also reached on errors and when the client goes away mid-stream
+                audio_stream.close()
 
         except Exception as e:
             logger.error(f"Video file processing error: {e}")
-            self.status = "error"
-            return state, f"❌ Error processing video: {str(e)}", "error", None
+            state['status'] = "error"
+            yield state, f"❌ Error processing video: {str(e)}", "error", None
 
 # Create global processor instance
-processor = AudioProcessor(GlobalTranslator.get_instance())
+processor = AudioProcessor()
+
+def readiness_report():
+    """(ready, details) for /readyz: ready once the English path is loaded and warm"""
+    translator = GlobalTranslator._instance
+    details = {
+        'status': GlobalTranslator.state,
+        'requests_in_flight': processor.active_requests,
+        'last_latency_s': processor.last_latency_s,
+        'last_first_audio_s': processor.last_first_audio_s,
+    }
+    if GlobalTranslator.error:
+        details['error'] = GlobalTranslator.error
+    if translator is None:
+        return False, details
+
+    models = translator.model_status()
+    details['models'] = models
+    # Work waiting for a model: windows and segments queued for the next batch
+    details['queue_depth'] = {
+        'asr_windows': translator.asr_scheduler.pending_items(),
+        'translation_segments': translator.translator.scheduler.pending_items(),
+    }
+    pool = GlobalTranslator.worker_pool
+    if pool is not None:
+        # With workers the batch queues live in the worker processes; report the jobs waiting for one
+        details['queue_depth']['worker_jobs'] = pool.jobs_queued()
+        details['workers'] = pool.num_workers
+        details['worker_jobs_in_flight'] = pool.jobs_in_flight()
+
+    english_path = [translator.asr_engine_en.model_name, 'nllb-200-distilled-600M', f"tts-{translator.tts.name}"]
+    # A lazy model loads (and warms) on demand, so it never holds readiness back
+    ready = translator.is_ready('english') and all(
+        models[name]['warm'] or models[name]['lazy'] for name in english_path
+    )
+    if not ready:
+        details['status'] = "warming"
+    return ready, details
 
 def create_interface():
+    # Imported here so the background model load starts before gradio's slow import
+    import gradio as gr
+
     custom_css = r"""
     /* Modern Gradient Background */
     body {
@@ -772,7 +881,7 @@ def create_interface():
                         languages_display = gr.HTML(value=(
                             f"<div class='language-display'>"
                             f"<span style='opacity: 0.9;'>🌐 </span>"
-                            f"{processor.current_source_lang.title()} → {processor.current_target_lang.title()}"
+                            f"{DEFAULT_SOURCE_LANG.title()} → {DEFAULT_TARGET_LANG.title()}"
                             f"</div>"
                         ))
                         language_btn = gr.Button("⚙️ Change Languages", elem_classes="btn-secondary")
@@ -793,7 +902,7 @@ def create_interface():
                         source_lang = gr.Radio(
                             choices=["english", "hindi", "bengali", "tamil", "telugu", "marathi", 
                                 "gujarati", "kannada", "malayalam", "punjabi", "urdu"],
-                            value=processor.current_source_lang, 
+                            value=DEFAULT_SOURCE_LANG, 
                             label="",  # Remove label since we have header
                             show_label=False
                         )
@@ -808,7 +917,7 @@ def create_interface():
                         target_lang = gr.Radio(
                             choices=["hindi", "english", "bengali", "tamil", "telugu", "marathi", 
                                 "gujarati", "kannada", "malayalam", "punjabi", "urdu"],
-                            value=processor.current_target_lang, 
+                            value=DEFAULT_TARGET_LANG, 
                             label="",  # Remove label since we have header
                             show_label=False
                         )
@@ -899,6 +1008,8 @@ def create_interface():
                 tts_output = gr.Audio(
                     label="🔊 Translated Speech Output",
                     visible=False,
+                    streaming=True,
+                    autoplay=True,
                     elem_classes="result-box"
                 )
             
@@ -927,13 +1038,10 @@ def create_interface():
             """Close language panel"""
             return gr.update(visible=False)
 
-        def save_languages(src, tgt):
+        def save_languages(state, src, tgt):
             """Save language settings"""
             src = src.lower()
-            msg, status = processor.change_languages(src, tgt)
-            processor.current_source_lang = src
-            processor.current_target_lang = tgt
-            processor.status = status
+            msg, status = processor.change_languages(state, src, tgt)
             
             # Update status display with better visibility
             status_html = f"""
@@ -951,117 +1059,79 @@ def create_interface():
             </div>
             """
             
-            return gr.update(visible=False), status_html, langs_html, ""
+            return state, gr.update(visible=False), status_html, langs_html, ""
 
-        def process_audio_wrapper(state, fp):
+        def stream_results(updates, button):
+            """Turn (state, message, status, audio chunk) updates into streamed UI outputs"""
             try:
                 # Add click effect
-                audio_btn.add_class("button-loading")
+                button.add_class("button-loading")
             except Exception:
                 pass
             try:
-                state, res_msg, stat, tts_file = processor.process_audio_file(state, fp)
-                processor.status = stat
-                
-                # Enhanced status display with better visibility
-                if stat and "processing" in str(stat).lower():
-                    badge_class = "status-processing"
-                    badge_text = "🔄 Processing"
-                    message_class = "status-processing"
-                elif stat and str(stat).lower() in ("connected", "done", "success"):
-                    badge_class = "status-connected"
-                    badge_text = "✅ Completed"
-                    message_class = "status-success"
-                else:
-                    badge_class = "status-error"
-                    badge_text = "❌ Error"
-                    message_class = "status-error"
-                
-                status_html = f"""
-                <div style='display: flex; align-items: center; gap: 12px;'>
-                    <span class='status-indicator {badge_class}'></span>
-                    <span class='status-text'>{badge_text}</span>
-                </div>
-                """
-                
-                # Status message
-                status_msg = f"<div class='status-message {message_class}'>{res_msg}</div>"
-                
-                # Get texts from session state
-                orig_text = state['current_transcription'] or "Your speech will be transcribed here..."
-                trans_text = state['current_translation'] or "Translation will appear here..."
-                
-                return (
-                    state,
-                    status_msg, 
-                    orig_text, 
-                    trans_text, 
-                    gr.update(value=tts_file, visible=tts_file is not None),
-                    processor.get_history_display(state),
-                    status_html
-                )
+                # Show the player up front; audio chunks are streamed into it as they arrive
+                first_update = True
+                for state, res_msg, stat, audio_chunk in updates:
+                    # Enhanced status display with better visibility
+                    if stat and "processing" in str(stat).lower():
+                        badge_class = "status-processing"
+                        badge_text = "🔄 Processing"
+                        message_class = "status-processing"
+                    elif stat and str(stat).lower() in ("connected", "done", "success"):
+                        badge_class = "status-connected"
+                        badge_text = "✅ Completed"
+                        message_class = "status-success"
+                    else:
+                        badge_class = "status-error"
+                        badge_text = "❌ Error"
+                        message_class = "status-error"
+                    
+                    status_html = f"""
+                    <div style='display: flex; align-items: center; gap: 12px;'>
+                        <span class='status-indicator {badge_class}'></span>
+                        <span class='status-text'>{badge_text}</span>
+                    </div>
+                    """
+                    
+                    # Status message
+                    status_msg = f"<div class='status-message {message_class}'>{res_msg}</div>"
+                    
+                    # Get texts from session state
+                    orig_text = state['current_transcription'] or "Your speech will be transcribed here..."
+                    trans_text = state['current_translation'] or "Translation will appear here..."
+                    
+                    if audio_chunk is not None:
+                        tts_update = audio_chunk
+                    elif first_update:
+                        tts_update = gr.update(visible=True)
+                    else:
+                        tts_update = gr.update()
+                    first_update = False
+                    
+                    yield (
+                        state,
+                        status_msg, 
+                        orig_text, 
+                        trans_text, 
+                        tts_update,
+                        processor.get_history_display(state),
+                        status_html
+                    )
             finally:
                 try:
-                    audio_btn.remove_class("button-loading")
+                    button.remove_class("button-loading")
                 except Exception:
                     pass
 
+        def process_audio_wrapper(state, fp):
+            yield from stream_results(processor.iter_process_audio_file(state, fp), audio_btn)
+
         def process_video_wrapper(state, fp):
-            try:
-                # Add click effect
-                video_btn.add_class("button-loading")
-            except Exception:
-                pass
-            try:
-                state, res_msg, stat, tts_file = processor.process_video_file(state, fp)
-                processor.status = stat
-                
-                # Enhanced status display with better visibility
-                if stat and "processing" in str(stat).lower():
-                    badge_class = "status-processing"
-                    badge_text = "🔄 Processing"
-                    message_class = "status-processing"
-                elif stat and str(stat).lower() in ("connected", "done", "success"):
-                    badge_class = "status-connected"
-                    badge_text = "✅ Completed"
-                    message_class = "status-success"
-                else:
-                    badge_class = "status-error"
-                    badge_text = "❌ Error"
-                    message_class = "status-error"
-                
-                status_html = f"""
-                <div style='display: flex; align-items: center; gap: 12px;'>
-                    <span class='status-indicator {badge_class}'></span>
-                    <span class='status-text'>{badge_text}</span>
-                </div>
-                """
-                
-                # Status message
-                status_msg = f"<div class='status-message {message_class}'>{res_msg}</div>"
-                
-                # Get texts from session state
-                orig_text = state['current_transcription'] or "Your speech will be transcribed here..."
-                trans_text = state['current_translation'] or "Translation will appear here..."
-                
-                return (
-                    state,
-                    status_msg, 
-                    orig_text, 
-                    trans_text, 
-                    gr.update(value=tts_file, visible=tts_file is not None),
-                    processor.get_history_display(state),
-                    status_html
-                )
-            finally:
-                try:
-                    video_btn.remove_class("button-loading")
-                except Exception:
-                    pass
+            yield from stream_results(processor.iter_process_video_file(state, fp), video_btn)
 
         # UI tick function
         def ui_tick(state, trigger=""):
-            st = getattr(processor, "status", "connected") or "connected"
+            st = state.get('status') or "connected"
             st_low = str(st).lower()
             
             if "processing" in st_low:
@@ -1084,7 +1154,7 @@ def create_interface():
             langs_html = f"""
             <div class='language-display'>
                 <span style='opacity: 0.9;'>🌐 </span>
-                {processor.current_source_lang.title()} → {processor.current_target_lang.title()}
+                {state['source_lang'].title()} → {state['target_lang'].title()}
             </div>
             """
 
@@ -1114,8 +1184,8 @@ def create_interface():
         )
         save_lang_btn.click(
             save_languages, 
-            inputs=[source_lang, target_lang], 
-            outputs=[language_panel, status_display, languages_display, status_trigger]
+            inputs=[session_state, source_lang, target_lang], 
+            outputs=[session_state, language_panel, status_display, languages_display, status_trigger]
         )
 
         # Connect file processing with proper outputs including session state
@@ -1153,6 +1223,16 @@ if __name__ == "__main__":
     print("🚀 FILE TRANSLATOR STARTING...")
     
     demo = create_interface()
+    # Sessions are isolated, so several requests can share the models at once
+    demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT)
+    
+    # Health endpoints next to the UI: /healthz (alive) and /readyz (models loaded and warm)
+    import gradio as gr
+    import uvicorn
+    from fastapi import FastAPI
+    from health import add_health_routes
+    server = add_health_routes(FastAPI(), readiness_report)
+    server = gr.mount_gradio_app(server, demo, path="/")
     
     # For Hugging Face Spaces
-    demo.launch(server_name="0.0.0.0", server_port=7860, share=True)
+    uvicorn.run(server, host="0.0.0.0", port=7860)
@@ -0,0 +1,216 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from quantization import (
+    CT2_COMPUTE_TYPE, CT2_CPU_THREADS, QUANTIZATION, pretrained_load_kwargs, quantize_model, whisper_quality_sample
+)
+
+# "transformers" (default) or "ctranslate2" (faster-whisper)
+ASR_ENGINE = os.environ.get("S2ST_ASR_ENGINE", "transformers").lower()
+# Cross-session batching: windows from concurrent requests for the same model and
+# language are decoded together, up to ASR_MAX_BATCH windows per generate call
+ASR_MAX_BATCH = int(os.environ.get("S2ST_ASR_MAX_BATCH", "8"))
+ASR_MAX_WAIT_MS = float(os.environ.get("S2ST_ASR_MAX_WAIT_MS", "30"))
+# Whisper models loaded at startup ("whisper-tiny,whisper-medium", "all" or "none");
+# the others load on the first request that needs them
+PRELOAD_MODELS = os.environ.get("S2ST_PRELOAD_MODELS", "whisper-tiny")
+# Lazily loaded models unused for this many seconds are unloaded again (0 = never)
+MODEL_IDLE_UNLOAD_S = float(os.environ.get("S2ST_MODEL_IDLE_UNLOAD_S", "900"))
+
+
+def warm_up_window(sample_rate=16000, seconds=30):
+    """Deterministic full-length window (speech-band noise with a syllable-rate
+    envelope) so warm-up runs the same 30 s mel shape as real requests"""
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * sample_rate) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (0.05 * envelope * rng.standard_normal(len(t))).astype(np.float32)
+
+
+# -------------------- ASR ENGINE INTERFACE --------------------
+class ASREngine:
+    """Backend that turns <=30 s windows of 16 kHz mono audio into text"""
+
+    name = "base"
+
+    def __init__(self, model_size):
+        self.model_size = model_size
+        self.model_name = f"whisper-{model_size}"
+        self.precision = None
+        self.sample_rate = 16000
+        self.model = None
+        self.processor = None
+        self.warm_up_s = None  # seconds the last warm-up took; None until warmed
+        # What the warm-up decodes with; set to the language and length real requests use
+        self.warm_up_language = 'en'
+        self.warm_up_max_length = 225
+        self.last_used = 0.0
+        self._users = 0
+        self._lifecycle_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.model is not None
+
+    def load(self):
+        raise NotImplementedError
+
+    def unload(self):
+        """Release the weights; the next in_use() loads them again"""
+        self.model = None
+        self.processor = None
+        self.warm_up_s = None
+        gc.collect()
+
+    def warm_up(self, language='en', max_length=225):
+        """Decode one full window so the first real request skips one-off setup costs"""
+        started = time.time()
+        self.transcribe([warm_up_window(self.sample_rate)], language, max_length=max_length)
+        self.warm_up_s = time.time() - started
+        return self.warm_up_s
+
+    @contextmanager
+    def in_use(self):
+        """Load (and warm up) on first use and keep the model resident while any caller holds it"""
+        with self._lifecycle_lock:
+            if not self.loaded:
+                started = time.time()
+                self.load()
+                print(f"✅ {self.model_name} loaded in {time.time() - started:.1f}s")
+                # Every load is warmed once, whether at startup, lazily or after an idle unload
+                try:
+                    self.warm_up(self.warm_up_language, max_length=self.warm_up_max_length)
+                    print(f"   🔥 {self.model_name}: {self.warm_up_s:.2f}s")
+                except Exception as e:
+                    print(f"⚠️ {self.model_name} warm-up failed: {e}")
+            self._users += 1
+        try:
+            yield self
+        finally:
+            with self._lifecycle_lock:
+                self._users -= 1
+                self.last_used = time.monotonic()
+
+    def unload_if_idle(self, idle_s):
+        """Unload if nobody is using the model and it has been idle for idle_s seconds"""
+        with self._lifecycle_lock:
+            if self.loaded and self._users == 0 and time.monotonic() - self.last_used >= idle_s:
+                self.unload()
+                return True
+        return False
+
+    def transcribe(self, windows, language, max_length=225):
+        """Transcribe a batch of audio windows, returning one string per window"""
+        raise NotImplementedError
+
+
+# -------------------- TRANSFORMERS ENGINE --------------------
+class TransformersWhisperEngine(ASREngine):
+    name = "transformers"
+
+    def __init__(self, model_size, quantization=QUANTIZATION):
+        super().__init__(model_size)
+        self.quantization = quantization
+
+    def load(self):
+        from transformers import WhisperForConditionalGeneration, WhisperProcessor
+
+        print(f"📥 Loading {self.model_name} (transformers)...")
+        processor = WhisperProcessor.from_pretrained(f"openai/{self.model_name}")
+        model = WhisperForConditionalGeneration.from_pretrained(
+            f"openai/{self.model_name}", **pretrained_load_kwargs()
+        )
+        model.eval()
+        model, precision = quantize_model(
+            model, self.quantization, self.model_name, whisper_quality_sample(processor)
+        )
+        # in_use() calls load() under _lifecycle_lock; publishing the model last keeps
+        # `loaded` False until it is quantized and ready
+        self.processor, self.precision, self.model = processor, precision, model
+
+    def transcribe(self, windows, language, max_length=225):
+        import torch
+
+        inputs = self.processor(
+            windows,
+            sampling_rate=self.sample_rate,
+            return_tensors="pt"
+        )
+
+        with torch.no_grad():
+            # ✅ ALL LANGUAGES GET FORCED LANGUAGE (forces the correct script output)
+            generated_ids = self.model.generate(
+                inputs.input_features,
+                language=language,
+                task="transcribe",
+                max_length=max_length,
+                num_beams=3,
+                temperature=0.0,
+            )
+
+        return [text.strip() for text in self.processor.batch_decode(generated_ids, skip_special_tokens=True)]
+
+
+# -------------------- CTRANSLATE2 ENGINE --------------------
+class CTranslate2WhisperEngine(ASREngine):
+    """faster-whisper (CTranslate2) engine, int8 on CPU by default"""
+
+    name = "ctranslate2"
+
+    def __init__(self, model_size, compute_type=CT2_COMPUTE_TYPE, cpu_threads=CT2_CPU_THREADS):
+        super().__init__(model_size)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+
+    def load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError("S2ST_ASR_ENGINE=ctranslate2 requires `pip install faster-whisper`") from e
+
+        print(f"📥 Loading {self.model_name} (CTranslate2, {self.compute_type})...")
+        model = WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+        )
+        self.precision, self.model = self.compute_type, model
+
+    def transcribe(self, windows, language, max_length=225):
+        import ctranslate2
+        from faster_whisper.tokenizer import Tokenizer
+
+        # WhisperModel.transcribe() handles one clip at a time, so the batch goes
+        # straight to the CTranslate2 model as stacked, 30 s-padded mel features
+        extractor = self.model.feature_extractor
+        frames = extractor.nb_max_frames
+        features = []
+        for window in windows:
+            mel = extractor(np.asarray(window, dtype=np.float32))[:, :frames]
+            features.append(np.pad(mel, ((0, 0), (0, frames - mel.shape[1]))))
+
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer, self.model.model.is_multilingual, task="transcribe", language=language
+        )
+        prompt = list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+        results = self.model.model.generate(
+            ctranslate2.StorageView.from_array(np.ascontiguousarray(np.stack(features), dtype=np.float32)),
+            [prompt] * len(features),
+            beam_size=3,
+            max_length=len(prompt) + max_length,
+        )
+        return [tokenizer.decode(result.sequences_ids[0]).strip() for result in results]
+
+
+def create_asr_engine(model_size, engine=ASR_ENGINE, quantization=QUANTIZATION):
+    """Build the configured ASR engine for a Whisper model size ("tiny", "medium", ...)"""
+    if engine == CTranslate2WhisperEngine.name:
+        # CTranslate2 quantizes at conversion/load time via S2ST_CT2_COMPUTE_TYPE
+        return CTranslate2WhisperEngine(model_size)
+    if engine != TransformersWhisperEngine.name:
+        print(f"⚠️ Unknown ASR engine '{engine}', falling back to transformers")
+    return TransformersWhisperEngine(model_size, quantization=quantization)
@@ -0,0 +1,300 @@
+import io
+import os
+import struct
+import subprocess
+import threading
+from math import gcd
+import numpy as np
+
+
+# -------------------- RESAMPLING --------------------
+_filter_cache = {}
+
+
+def _polyphase_filter(up, down, half_width=10, beta=5.0):
+    """Kaiser-windowed sinc low-pass split into `up` phases of `n_taps` each"""
+    key = (up, down, half_width, beta)
+    if key not in _filter_cache:
+        max_rate = max(up, down)
+        length = 2 * half_width * max_rate + 1
+        n = np.arange(length) - half_width * max_rate
+        h = np.sinc(n / max_rate) * np.kaiser(length, beta)
+        h = h / h.sum() * up
+
+        n_taps = -(-length // up)
+        padded = np.zeros(n_taps * up)
+        padded[:length] = h
+        # phases[p, j] = h[p + j * up]
+        phases = padded.reshape(n_taps, up).T.astype(np.float32)
+        _filter_cache[key] = (phases, n_taps, half_width * max_rate)
+    return _filter_cache[key]
+
+
+def resample(audio, orig_sr, target_sr, block_size=32768):
+    """Vectorized rational polyphase resampler (no per-sample Python loops)"""
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+
+    g = gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // g, int(orig_sr) // g
+    phases, n_taps, center = _polyphase_filter(up, down)
+
+    x = np.concatenate([np.zeros(n_taps, np.float32), audio.astype(np.float32), np.zeros(n_taps, np.float32)])
+    out_len = -(-len(audio) * up // down)
+    out = np.empty(out_len, dtype=np.float32)
+    taps = np.arange(n_taps)
+
+    for start in range(0, out_len, block_size):
+        m = np.arange(start, min(start + block_size, out_len))
+        s = m * down + center
+        base = s // up + n_taps
+        phase = s % up
+        out[start:start + len(m)] = np.einsum("ij,ij->i", x[base[:, None] - taps[None, :]], phases[phase])
+    return out
+
+
+def to_mono(audio):
+    """Average channels of a (frames, channels) array"""
+    if audio.ndim > 1:
+        return audio.mean(axis=1)
+    return audio
+
+
+# -------------------- DECODING --------------------
+def decode_audio_bytes(data, target_sr=None):
+    """Decode an encoded clip (WAV, MP3, ...) held in memory.
+
+    Returns (sample_rate, float32 mono ndarray), the tuple gr.Audio accepts
+    directly. The native rate is kept unless target_sr is given.
+    """
+    try:
+        import soundfile as sf
+        audio, sr = sf.read(io.BytesIO(data), dtype="float32", always_2d=False)
+        audio = to_mono(audio)
+    except Exception:
+        # Older libsndfile builds cannot read MP3; ffmpeg reads the bytes from stdin
+        sr = target_sr or 22050
+        command = [
+            "ffmpeg", "-i", "pipe:0", "-f", "f32le", "-ac", "1", "-ar", str(sr), "-loglevel", "quiet", "-"
+        ]
+        result = subprocess.run(command, input=data, check=True, stdout=subprocess.PIPE)
+        audio = np.frombuffer(result.stdout, dtype=np.float32)
+
+    if target_sr and sr != target_sr:
+        audio = resample(audio, sr, target_sr)
+        sr = target_sr
+    return sr, audio
+
+
+# -------------------- FAST LOADING --------------------
+def _read_wav_header(file_path):
+    """Locate the PCM payload of a WAV file: (format, channels, rate, bits, data offset, data bytes).
+
+    Returns None for anything this parser cannot handle (not RIFF/WAVE,
+    truncated, unreadable), leaving the file to the slower decoders.
+    """
+    try:
+        return _parse_wav_header(file_path)
+    except (struct.error, OSError):
+        return None
+
+
+def _parse_wav_header(file_path):
+    with open(file_path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                audio_format, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if audio_format == 0xFFFE and len(body) >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE: the real format is the start of the sub-format GUID
+                    audio_format = struct.unpack("<H", body[24:26])[0]
+                fmt = (audio_format, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                return fmt + (f.tell(), size)
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def _load_wav_memmap(file_path):
+    """Map 16-bit / float32 PCM WAV data straight from disk. Returns (sr, audio) or None."""
+    info = _read_wav_header(file_path)
+    if info is None:
+        return None
+    audio_format, channels, rate, bits, offset, size = info
+    if (audio_format, bits) == (1, 16):
+        dtype, scale = np.int16, 1.0 / 32768.0
+    elif (audio_format, bits) == (3, 32):
+        dtype, scale = np.float32, None
+    else:
+        return None
+
+    if channels == 0:
+        return None
+    frames = min(size, os.path.getsize(file_path) - offset) // (np.dtype(dtype).itemsize * channels)
+    if frames <= 0:
+        # np.memmap cannot map an empty region
+        return rate, np.zeros(0, dtype=np.float32)
+    data = np.memmap(file_path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    audio = to_mono(data) if channels > 1 else data[:, 0]
+    audio = audio.astype(np.float32, copy=False) if scale is None else audio.astype(np.float32) * np.float32(scale)
+    return rate, audio
+
+
+def load_audio(file_path, sample_rate=16000):
+    """Load any audio file as float32 mono at sample_rate, avoiding librosa's generic resampler.
+
+    WAV: PCM payload is memory-mapped. WAV/FLAC/OGG: decoded by soundfile.
+    Anything else: streamed through an ffmpeg pipe. Rates that differ are
+    converted with the vectorized polyphase resampler above.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    decoded = None
+
+    if ext == ".wav":
+        decoded = _load_wav_memmap(file_path)
+
+    if decoded is None and ext in (".wav", ".flac", ".ogg", ".oga", ".aiff", ".aif"):
+        try:
+            import soundfile as sf
+            audio, rate = sf.read(file_path, dtype="float32", always_2d=False)
+            decoded = (rate, to_mono(audio))
+        except Exception:
+            decoded = None
+
+    if decoded is None:
+        # ffmpeg resamples while decoding, so the stream is already at sample_rate
+        try:
+            stream = FFmpegAudioStream(file_path, sample_rate=sample_rate)
+            for _ in stream:
+                pass
+            return stream.audio().copy()
+        except Exception as e:
+            print(f"⚠️ ffmpeg decode failed ({e}), falling back to librosa")
+            import librosa
+            audio, _ = librosa.load(file_path, sr=sample_rate)
+            return audio
+
+    rate, audio = decoded
+    return resample(np.ascontiguousarray(audio, dtype=np.float32), rate, sample_rate)
+
+
+# -------------------- STREAMING EXTRACTION --------------------
+class FFmpegAudioStream:
+    """Decode the audio track of any media file through an ffmpeg pipe.
+
+    A reader thread copies ffmpeg's raw f32le stdout straight into a
+    preallocated NumPy buffer (grown geometrically when needed) while
+    iterating yields each completed chunk, so consumers such as ASR can
+    start before extraction has finished. No temp files are written.
+    """
+
+    def __init__(self, file_path, sample_rate=16000, chunk_seconds=30, initial_seconds=600):
+        self.file_path = file_path
+        self.sample_rate = sample_rate
+        self.chunk_samples = int(chunk_seconds * sample_rate)
+        self.buffer = np.empty(int(initial_seconds * sample_rate), dtype=np.float32)
+        self.length = 0
+        self.done = False
+        self.closed = False
+        self.error = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._process = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._read, daemon=True)
+            self._thread.start()
+        return self
+
+    def _read(self):
+        command = [
+            "ffmpeg", "-i", self.file_path, "-vn", "-f", "f32le", "-ac", "1", "-ar", str(self.sample_rate),
+            "-loglevel", "quiet", "-"
+        ]
+        process = None
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE)
+            with self._cond:
+                self._process = process
+                if self.closed:
+                    return
+            leftover = b""
+            with process.stdout as pipe:
+                while not self.closed:
+                    if self.length + self.chunk_samples > len(self.buffer):
+                        grown = np.empty(max(len(self.buffer) * 2, self.length + self.chunk_samples), dtype=np.float32)
+                        grown[:self.length] = self.buffer[:self.length]
+                        with self._cond:
+                            self.buffer = grown
+
+                    # Read straight into the free tail of the buffer
+                    target = self.buffer[self.length:self.length + self.chunk_samples].view(np.uint8)
+                    target[:len(leftover)] = np.frombuffer(leftover, dtype=np.uint8)
+                    n_bytes = len(leftover) + (pipe.readinto(memoryview(target)[len(leftover):]) or 0)
+                    if n_bytes == len(leftover):
+                        break
+
+                    whole = n_bytes - n_bytes % 4
+                    leftover = bytes(target[whole:n_bytes])
+                    with self._cond:
+                        self.length += whole // 4
+                        self._cond.notify_all()
+
+            if process.wait() != 0 and not self.closed:
+                raise subprocess.CalledProcessError(process.returncode, command)
+        except Exception as e:
+            if not self.closed:
+                self.error = e
+        finally:
+            # Never leave ffmpeg decoding into a pipe nobody reads
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def close(self):
+        """Stop decoding: kill ffmpeg and wake anyone waiting for more audio"""
+        with self._cond:
+            self.closed = True
+            self.done = True
+            process = self._process
+            self._cond.notify_all()
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def __iter__(self):
+        """Yield float32 chunks of about chunk_seconds as they are decoded"""
+        self.start()
+        position = 0
+        while True:
+            with self._cond:
+                while not self.done and self.length - position < self.chunk_samples:
+                    self._cond.wait()
+                end = self.length
+                buffer = self.buffer
+                finished = self.done
+            if end > position:
+                yield buffer[position:end]
+                position = end
+            if finished and position >= self.length or self.closed:
+                break
+        if self.error is not None:
+            raise self.error
+
+    def audio(self):
+        """All audio decoded so far"""
+        with self._cond:
+            return self.buffer[:self.length]
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+_batchers = weakref.WeakSet()
+
+
+# -------------------- MICRO-BATCHING SCHEDULER --------------------
+class MicroBatcher:
+    """Merge concurrent inference requests into shared batches.
+
+    Callers submit(key, items) from any thread and block until their results
+    are ready. Each key (model, language, ...) gets its own dispatcher thread,
+    which waits up to max_wait_ms after the oldest pending request, gathers
+    everything queued under that key (up to max_batch_size items), runs
+    process_batch(key, items) once and hands each caller back its own slice
+    of the results. Requests with different keys are never mixed and never
+    wait for each other; a dispatcher exits once its key has no more work.
+    """
+
+    def __init__(self, process_batch, max_batch_size=8, max_wait_ms=30, name="batch"):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self._reset()
+        _batchers.add(self)
+
+    def _reset(self):
+        self._pending = {}  # key -> [(items, future, arrival time), ...]
+        self._dispatchers = set()  # keys with a running dispatcher thread
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self):
+        return self.max_batch_size > 1 and self.max_wait > 0
+
+    def submit(self, key, items):
+        """Process items together with other callers' items for the same key"""
+        items = list(items)
+        if not items:
+            return []
+        if not self.enabled:
+            return list(self.process_batch(key, items))
+
+        future = Future()
+        with self._cond:
+            self._pending.setdefault(key, []).append((items, future, time.monotonic()))
+            if key not in self._dispatchers:
+                self._dispatchers.add(key)
+                threading.Thread(
+                    target=self._dispatch, args=(key,), name=f"{self.name}-batcher", daemon=True
+                ).start()
+            self._cond.notify_all()
+        return future.result()
+
+    def pending_items(self):
+        """Items submitted but not yet taken into a batch, across all keys"""
+        with self._cond:
+            return sum(len(items) for queue in self._pending.values() for items, _, _ in queue)
+
+    def stats(self):
+        """Batches run and the average number of items per batch"""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+        }
+
+    def _take(self, key):
+        """Pop whole requests for key until the batch is full (always at least one)"""
+        queue = self._pending[key]
+        taken, size = [], 0
+        while queue and (not taken or size + len(queue[0][0]) <= self.max_batch_size):
+            request = queue.pop(0)
+            taken.append(request)
+            size += len(request[0])
+        if not queue:
+            del self._pending[key]
+        return taken
+
+    def _dispatch(self, key):
+        while True:
+            with self._cond:
+                if key not in self._pending:
+                    self._dispatchers.discard(key)
+                    return
+                deadline = self._pending[key][0][2] + self.max_wait
+                while sum(len(items) for items, _, _ in self._pending[key]) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                requests = self._take(key)
+
+            batch = [item for items, _, _ in requests for item in items]
+            try:
+                results = list(self.process_batch(key, batch))
+            except Exception as e:
+                for _, future, _ in requests:
+                    future.set_exception(e)
+                continue
+
+            with self._cond:
+                self.batches += 1
+                self.items += len(batch)
+            start = 0
+            for items, future, _ in requests:
+                future.set_result(results[start:start + len(items)])
+                start += len(items)
+
+
+def _reset_after_fork():
+    # The dispatcher thread does not survive fork; a child starts its own on first use
+    for batcher in list(_batchers):
+        batcher._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
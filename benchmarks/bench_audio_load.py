@@ -0,0 +1,87 @@
+"""Benchmark audio_io.load_audio against the previous librosa.load(sr=16000) path.
+
+Usage: python benchmarks/bench_audio_load.py [--seconds 300] [--repeat 3] [files ...]
+
+Without files, synthetic WAV clips are generated (16 kHz mono, 44.1 kHz
+stereo, 48 kHz mono) plus a FLAC copy when soundfile is installed.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_io import load_audio  # noqa: E402
+
+
+def write_wav(path, rate, channels, seconds):
+    t = np.arange(int(rate * seconds)) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * np.random.default_rng(0).standard_normal(len(t))
+    pcm = (np.clip(tone, -1, 1) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.repeat(pcm[:, None], channels, axis=1).tobytes())
+
+
+def synthetic_files(directory, seconds):
+    files = []
+    for rate, channels in [(16000, 1), (44100, 2), (48000, 1)]:
+        path = os.path.join(directory, f"tone_{rate}hz_{channels}ch.wav")
+        write_wav(path, rate, channels, seconds)
+        files.append(path)
+    try:
+        import soundfile as sf
+        audio, rate = sf.read(files[1])
+        flac = os.path.join(directory, "tone_44100hz_2ch.flac")
+        sf.write(flac, audio, rate)
+        files.append(flac)
+    except Exception:
+        pass
+    return files
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--seconds", type=float, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files or synthetic_files(directory, args.seconds)
+
+        try:
+            start = time.perf_counter()
+            import librosa
+            print(f"import librosa: {time.perf_counter() - start:.2f}s")
+        except ImportError:
+            librosa = None
+            print("librosa not installed, timing load_audio only")
+
+        print(f"{'file':<28} {'load_audio':>11} {'librosa':>10} {'speedup':>8}")
+        for path in files:
+            fast = best_of(lambda: load_audio(path, 16000), args.repeat)
+            if librosa is not None:
+                slow = best_of(lambda: librosa.load(path, sr=16000), args.repeat)
+                print(f"{os.path.basename(path):<28} {fast:>10.3f}s {slow:>9.3f}s {slow / fast:>7.1f}x")
+            else:
+                print(f"{os.path.basename(path):<28} {fast:>10.3f}s {'-':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure cold import time of the project modules with `python -X importtime`.
+
+Usage: python benchmarks/bench_import_time.py [--top 15] [--repeat 3] [modules ...]
+
+Each module is imported in a fresh interpreter. The script prints the best
+wall time and the slowest dependencies by cumulative import time. It also
+flags heavy packages (torch, transformers, gradio, librosa, gtts) that were
+imported even though no model was loaded.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["audio_io", "pipeline", "asr_engines", "translation_engines", "tts_engines", "model"]
+HEAVY_PACKAGES = ["torch", "transformers", "gradio", "librosa", "gtts", "ctranslate2", "faster_whisper"]
+
+
+def import_profile(module):
+    """Import module in a new interpreter; returns (wall seconds, [(cumulative us, self us, name)])"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return elapsed, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    summary = []
+    for module in args.modules:
+        try:
+            runs = [import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"❌ import {module} failed: {e}")
+            continue
+        elapsed, entries = min(runs, key=lambda run: run[0])
+        imported = {name.strip() for _, _, name in entries}
+        heavy = [package for package in HEAVY_PACKAGES if package in imported]
+        summary.append((module, elapsed, heavy))
+
+        print(f"\n== import {module}: {elapsed:.3f}s wall (best of {args.repeat}) ==")
+        print(f"{'cumulative':>12} {'self':>10}  module")
+        for cumulative_us, self_us, name in sorted(entries, reverse=True)[:args.top]:
+            print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+
+    print(f"\n{'module':<22} {'wall':>8}  heavy packages imported")
+    for module, elapsed, heavy in summary:
+        print(f"{module:<22} {elapsed:>7.3f}s  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
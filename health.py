@@ -0,0 +1,29 @@
+import time
+from fastapi.responses import JSONResponse
+
+_started = time.time()
+
+
+# -------------------- HEALTH ENDPOINTS --------------------
+def add_health_routes(app, readiness_report):
+    """Register /healthz (liveness) and /readyz (readiness) on a FastAPI app.
+
+    readiness_report() returns (ready, details); /readyz answers 200 when
+    ready and 503 otherwise, with the details as JSON either way, so a load
+    balancer only routes traffic to replicas whose models are loaded and warm.
+    """
+
+    @app.get("/healthz")
+    def healthz():
+        # The process is up and serving HTTP, whatever state the models are in
+        return {"status": "alive", "uptime_s": round(time.time() - _started, 1)}
+
+    @app.get("/readyz")
+    def readyz():
+        try:
+            ready, details = readiness_report()
+        except Exception as e:
+            ready, details = False, {"status": "error", "error": str(e)}
+        return JSONResponse(details, status_code=200 if ready else 503)
+
+    return app
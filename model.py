@@ -1,138 +1,263 @@
-import torch
 import numpy as np
-import tempfile
-import os
-from transformers import WhisperForConditionalGeneration, WhisperProcessor, AutoModelForSeq2SeqLM, AutoTokenizer
-from gtts import gTTS
+import threading
+import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from vad import EnergyVAD
+from segmentation import segment_text
+from quantization import QUANTIZATION
+from asr_engines import (
+    ASR_ENGINE, ASR_MAX_BATCH, ASR_MAX_WAIT_MS, MODEL_IDLE_UNLOAD_S, PRELOAD_MODELS, create_asr_engine
+)
+from batching import MicroBatcher
+from translation_engines import (
+    TRANSLATION_ENGINE, TRANSLATION_MAX_BATCH, TRANSLATION_MAX_WAIT_MS, create_translation_engine
+)
+from translation_cache import TRANSLATION_CACHE_PATH, PersistentTranslationCache, normalize_cache_text
+from tts_engines import TTS_ENGINE, create_tts_engine
 
 # -------------------- WARM-UP --------------------
-def warm_up_models(asr_model, asr_processor, translator_model, translator_tokenizer):
+def warm_up_models(translator):
+    """Warm the loaded NLLB and TTS models once and report how long each took.
+
+    Whisper engines are not handled here: in_use() warms each one as part of
+    loading it, whether that happens at startup or on first use.
+    """
+    with translator.warm_up_lock:
+        return _warm_up_loaded_models(translator)
+
+
+def _warm_up_loaded_models(translator):
     print("🚀 Warming up models... please wait (first-time latency only)")
+    timings = {}
 
-    # Warm up ASR model (using English model for warm-up)
-    dummy_audio = np.zeros(16000)
-    inputs = asr_processor(dummy_audio, sampling_rate=16000, return_tensors="pt")
-    with torch.no_grad():
-        _ = asr_model.generate(**inputs)
-
-    # Warm up translation model
-    dummy_text = "Hello"
-    inputs = translator_tokenizer(dummy_text, return_tensors="pt")
-    with torch.no_grad():
-        _ = translator_model.generate(**inputs)
-
-    # Warm up TTS
-    try:
-        tts = gTTS(text="Test", lang="en", slow=False)
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-            temp_path = tmp_file.name
-        tts.save(temp_path)
-        os.unlink(temp_path)
-    except Exception as e:
-        print(f"⚠️ gTTS warm-up skipped: {e}")
-
-    print("✅ Warm-up complete. Models are ready.\n")
-
-
-# -------------------- TTS --------------------
-class GoogleTTSWrapper:
-    def __init__(self):
-        self.language_map = {
-            'hindi': 'hi', 'english': 'en', 'bengali': 'bn', 'tamil': 'ta',
-            'telugu': 'te', 'marathi': 'mr', 'gujarati': 'gu', 'kannada': 'kn',
-            'malayalam': 'ml', 'punjabi': 'pa', 'odia': 'or', 'assamese': 'as', 'urdu': 'ur'
-        }
+    nllb = translator.translator.engine
+    if nllb is not None and nllb.warm_up_s is None:
+        timings[translator.translator.model_name.split("/")[-1]] = nllb.warm_up()
 
-    def get_language_code(self, language_name):
-        return self.language_map.get(language_name.lower(), 'hi')
+    if translator.tts is not None:
+        elapsed = translator.tts.warm_up()
+        if elapsed is not None:
+            timings[f"tts-{translator.tts.name}"] = elapsed
 
-    def text_to_speech_file(self, text, language_name):
-        try:
-            lang_code = self.get_language_code(language_name)
-            tts = gTTS(text=text, lang=lang_code, slow=False)
-            tmp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-            tts.save(tmp_file.name)
-            return tmp_file.name
-        except Exception as e:
-            print(f"❌ Google TTS error: {e}")
-            return None
+    translator.warm_up_times.update(timings)
+    for name, elapsed in timings.items():
+        print(f"   🔥 {name}: {elapsed:.2f}s")
+    print(f"✅ Warm-up complete in {sum(timings.values()):.1f}s. Models are ready.\n")
+    return timings
 
-    def text_to_speech(self, text, language_name):
-        return self.text_to_speech_file(text, language_name)
+
+# -------------------- ASR HELPERS --------------------
+def _normalize_word(word):
+    return word.strip(".,!?;:\"'।॥۔،؟").lower()
+
+
+def drop_overlapping_words(previous, current, max_overlap_words=30, min_overlap_words=2):
+    """Strip the head of `current` that repeats the tail of `previous` (overlapping windows)"""
+    prev_words = previous.split()
+    cur_words = current.split()
+    limit = min(len(prev_words), len(cur_words), max_overlap_words)
+
+    for n in range(limit, min_overlap_words - 1, -1):
+        tail = [_normalize_word(w) for w in prev_words[-n:]]
+        head = [_normalize_word(w) for w in cur_words[:n]]
+        if tail == head:
+            return " ".join(cur_words[n:])
+    return " ".join(cur_words)
 
 
 # -------------------- TRANSLATOR --------------------
 class NLLBTranslator:
-    def __init__(self):
+    def __init__(self, quantization=QUANTIZATION, engine=TRANSLATION_ENGINE, persistent_cache_path=TRANSLATION_CACHE_PATH):
         self.model_name = "facebook/nllb-200-distilled-600M"
+        self.quantization = quantization
+        self.engine_name = engine
+        self.engine = None
+        self.precision = None
         self.translation_cache = OrderedDict()
         self.cache_size = 500
+        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'disk_hits': 0, 'disk_misses': 0}
+        # Guards the LRU and its counters; translate_batch runs on many sessions' threads
+        self._cache_lock = threading.Lock()
+        # Second tier behind the in-process LRU, shared across processes and restarts
+        self.persistent_cache_path = persistent_cache_path
+        self.persistent_cache = None
+        self.max_batch_size = TRANSLATION_MAX_BATCH
+        # Concurrent requests for the same language pair share one padded generate call
+        self.scheduler = MicroBatcher(
+            self._translate_group, max_batch_size=self.max_batch_size,
+            max_wait_ms=TRANSLATION_MAX_WAIT_MS, name="nllb"
+        )
+        # NLLB was trained on inputs up to 128 tokens; longer text is sentence-split
+        self.max_input_tokens = 128
+        self.max_output_tokens = 256
         self.tokenizer = None
         self.model = None
 
-    def load_models(self):
-        print("🔄 Loading NLLB translation model...")
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
-        self.model.eval()
-        print("✅ NLLB translation model loaded")
-
-    def translate_text(self, text, source_lang, target_lang):
-        if not text.strip():
-            return text
-
-        cache_key = f"{source_lang}{target_lang}{text.strip().lower()}"
-        if cache_key in self.translation_cache:
-            return self.translation_cache[cache_key]
-
-        lang_map = {
+        self.lang_map = {
             'english': 'eng_Latn', 'hindi': 'hin_Deva', 'bengali': 'ben_Beng',
             'tamil': 'tam_Taml', 'telugu': 'tel_Telu', 'marathi': 'mar_Deva',
             'gujarati': 'guj_Gujr', 'kannada': 'kan_Knda', 'malayalam': 'mal_Mlym',
             'punjabi': 'pan_Guru', 'odia': 'ory_Orya', 'assamese': 'asm_Beng', 'urdu': 'urd_Arab'
         }
 
-        src_code = lang_map.get(source_lang.lower(), 'eng_Latn')
-        tgt_code = lang_map.get(target_lang.lower(), 'hin_Deva')
-
-        self.tokenizer.src_lang = src_code
-        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=128)
-        forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(tgt_code)
-
-        with torch.no_grad():
-            generated_tokens = self.model.generate(
-                **inputs,
-                forced_bos_token_id=forced_bos_token_id,
-                max_length=128,
-                num_beams=3,
-                early_stopping=True
-            )
+    def load_models(self):
+        print(f"🔄 Loading NLLB translation model ({self.engine_name} engine)...")
+        self.engine = create_translation_engine(
+            self.model_name,
+            engine=self.engine_name,
+            quantization=self.quantization,
+            max_input_tokens=self.max_input_tokens,
+            max_output_tokens=self.max_output_tokens,
+        )
+        self.engine.load()
+        self.tokenizer = self.engine.tokenizer
+        self.model = self.engine.model
+        self.precision = self.engine.precision
+
+        if self.persistent_cache_path:
+            try:
+                self.persistent_cache = PersistentTranslationCache(self.persistent_cache_path)
+                print(f"💾 Persistent translation cache: {self.persistent_cache_path}")
+            except Exception as e:
+                print(f"⚠️ Persistent translation cache disabled: {e}")
+        print("✅ NLLB translation model loaded")
 
-        translated_text = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
+    def _cache_key(self, text, src_code, tgt_code):
+        """Collision-free key: NLLB language codes plus NFC, whitespace-collapsed text"""
+        return (src_code, tgt_code, normalize_cache_text(text))
+
+    def _remember(self, cache_key, translated_text):
+        with self._cache_lock:
+            self.translation_cache[cache_key] = translated_text
+            if len(self.translation_cache) > self.cache_size:
+                self.translation_cache.popitem(last=False)
+                self.cache_stats['evictions'] += 1
+
+    def cache_info(self):
+        """Hit/miss/eviction counters for tuning cache_size"""
+        with self._cache_lock:
+            info = dict(self.cache_stats)
+            info['size'] = len(self.translation_cache)
+        lookups = info['hits'] + info['misses']
+        info['capacity'] = self.cache_size
+        info['hit_rate'] = info['hits'] / lookups if lookups else 0.0
+        if self.persistent_cache is not None:
+            info['disk_evictions'] = self.persistent_cache.evictions
+        return info
+
+    def _translate_group(self, key, texts):
+        """Scheduler callback: one generate call for texts that may come from several requests"""
+        src_code, tgt_code = key
+        # Sort by length so the padded batch wastes as little compute as possible; this
+        # is where segments from different sessions are merged, so it is the one sort
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        translations = self.engine.translate([texts[i] for i in order], src_code, tgt_code)
+        results = [None] * len(texts)
+        for i, translated_text in zip(order, translations):
+            results[i] = translated_text
+        return results
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        """Translate many segments at once; only cache misses reach the model"""
+        src_code = self.lang_map.get(source_lang.lower(), 'eng_Latn')
+        tgt_code = self.lang_map.get(target_lang.lower(), 'hin_Deva')
+
+        results = list(texts)
+        misses = OrderedDict()  # cache key -> positions in the batch
+
+        with self._cache_lock:
+            for i, text in enumerate(texts):
+                if not text.strip():
+                    continue
+                cache_key = self._cache_key(text, src_code, tgt_code)
+                if cache_key in self.translation_cache:
+                    self.translation_cache.move_to_end(cache_key)
+                    results[i] = self.translation_cache[cache_key]
+                    self.cache_stats['hits'] += 1
+                else:
+                    misses.setdefault(cache_key, []).append(i)
+                    self.cache_stats['misses'] += 1
+
+        if not misses:
+            return results
+
+        # Disk tier: anything translated before, by any process, skips the model
+        if self.persistent_cache is not None:
+            try:
+                stored = self.persistent_cache.get_many(src_code, tgt_code, [key[2] for key in misses])
+            except Exception as e:
+                print(f"⚠️ Persistent cache lookup failed: {e}")
+                stored = {}
+            with self._cache_lock:
+                self.cache_stats['disk_hits'] += len(stored)
+                self.cache_stats['disk_misses'] += len(misses) - len(stored)
+            for cache_key in list(misses):
+                if cache_key[2] in stored:
+                    translated_text = stored[cache_key[2]]
+                    for i in misses.pop(cache_key):
+                        results[i] = translated_text
+                    self._remember(cache_key, translated_text)
+            if not misses:
+                return results
+
+        # The scheduler sorts each merged batch by length before generate
+        pending = list(misses)
+        for start in range(0, len(pending), self.max_batch_size):
+            batch_keys = pending[start:start + self.max_batch_size]
+            batch = [key[2] for key in batch_keys]
+            translations = self.scheduler.submit((src_code, tgt_code), batch)
+            for cache_key, translated_text in zip(batch_keys, translations):
+                for i in misses[cache_key]:
+                    results[i] = translated_text
+                self._remember(cache_key, translated_text)
+
+            if self.persistent_cache is not None:
+                try:
+                    self.persistent_cache.put_many(src_code, tgt_code, list(zip(batch, translations)))
+                except Exception as e:
+                    print(f"⚠️ Persistent cache write failed: {e}")
+
+        return results
+
+    def segment(self, text):
+        """Sentence-split text into pieces that fit within max_input_tokens"""
+        return segment_text(text, self.max_input_tokens - 8, self.engine.count_tokens)
 
-        self.translation_cache[cache_key] = translated_text
-        if len(self.translation_cache) > self.cache_size:
-            self.translation_cache.popitem(last=False)
+    def translate_text(self, text, source_lang, target_lang):
+        if not text.strip():
+            return text
 
-        return translated_text
+        # Sentence-split so nothing is cut off at max_input_tokens; the pieces
+        # are translated together in one batch and reassembled in order
+        pieces = self.segment(text)
+        if len(pieces) > 1:
+            print(f"✂️ Translating {len(pieces)} segments")
+        return " ".join(self.translate_batch(pieces, source_lang, target_lang))
 
 # -------------------- LOW LATENCY TRANSLATOR --------------------
 class LowLatencyTranslator:
-    def __init__(self):
-        # Keep the same attribute names for app.py compatibility
-        self.asr_model = None  # This will be the active model based on language
-        self.asr_processor = None  # This will be the active processor
-        self.asr_model_en = None   # Fast model for English
-        self.asr_processor_en = None
-        self.asr_model_other = None   # Model for other languages
-        self.asr_processor_other = None
+    def __init__(self, quantization=QUANTIZATION, asr_engine=ASR_ENGINE, tts_engine=TTS_ENGINE,
+                 preload_models=PRELOAD_MODELS):
+        # ASR backend ("transformers" or "ctranslate2"), see asr_engines.py
+        self.asr_engine_name = asr_engine
+        self.asr_engine_en = None
+        self.asr_engine_other = None
+        # Whisper models are loaded on first use unless listed here, and
+        # unloaded again after idle_unload_s without requests
+        self.preload_models = self._parse_model_list(preload_models)
+        self.idle_unload_s = MODEL_IDLE_UNLOAD_S
+        self._idle_thread = None
         self.translator = None
         self.tts = None
+        self.tts_engine_name = tts_engine  # "gtts" or "mms", see tts_engines.py
+
+        # Weight precision per model ("fp32" or "int8"), chosen at load time
+        self.quantization = quantization
+        self.model_precision = {}
 
+        # Languages are per request (arguments), never stored on this shared object
         self.sample_rate = 16000
-        self.source_lang = 'english'
-        self.target_lang = 'hindi'
 
         self.whisper_lang_map = {
             'english': 'en',
@@ -142,113 +267,365 @@ class LowLatencyTranslator:
             'odia': 'or', 'assamese': 'as', 'urdu': 'ur'
         }
 
+        # Long-form ASR: Whisper only sees 30 s per pass, so longer clips are
+        # split into overlapping windows and the transcripts stitched back together
+        self.chunk_length_s = 30
+        self.chunk_overlap_s = 5
+        self.asr_batch_size = 4
+        self.asr_max_length = 225
+        # Streamed audio is decoded in regions that fill whole batches
+        self.stream_region_s = self.chunk_length_s * self.asr_batch_size
+
+        # Voice activity detection in front of ASR so silence is never decoded
+        self.use_vad = True
+        self.vad = EnergyVAD(sample_rate=self.sample_rate)
+
+        # Central ASR scheduler: concurrent sessions share generate calls
+        self.asr_scheduler = MicroBatcher(
+            self._transcribe_batch, max_batch_size=ASR_MAX_BATCH, max_wait_ms=ASR_MAX_WAIT_MS, name="asr"
+        )
+
+        # Seconds each model took to warm up, by model name
+        self.warm_up_times = {}
+        self.warm_up_lock = threading.Lock()
+        # Models load concurrently; errors of background loads are kept per model
+        self.load_futures = {}
+        self.load_errors = {}
+
         self.load_models()
-        # Use English model for warm-up (maintains compatibility)
-        warm_up_models(self.asr_model_en, self.asr_processor_en, self.translator.model, self.translator.tokenizer)
+        warm_up_models(self)
 
     def load_models(self):
-        print("🔄 Loading optimized ASR models...")
-        
-        # Fast model for English (whisper-tiny)
-        print("📥 Loading whisper-tiny for English...")
-        self.asr_processor_en = WhisperProcessor.from_pretrained("openai/whisper-tiny")
-        self.asr_model_en = WhisperForConditionalGeneration.from_pretrained("openai/whisper-tiny")
-        self.asr_model_en.eval()
-
-        # Model for other languages (whisper-medium)
-        print("📥 Loading whisper-medium for other languages...")
-        self.asr_processor_other = WhisperProcessor.from_pretrained("openai/whisper-medium")
-        self.asr_model_other = WhisperForConditionalGeneration.from_pretrained("openai/whisper-medium")
-        self.asr_model_other.eval()
-        
-        # Set default to English model for compatibility
-        self.asr_model = self.asr_model_en
-        self.asr_processor = self.asr_processor_en
-        
-        print("✅ ASR models loaded (tiny for English, medium for other languages)")
-
-        self.translator = NLLBTranslator()
+        """Load all startup models concurrently and return once English can be served.
+
+        whisper-tiny, NLLB and TTS are waited for; a preloaded whisper-medium
+        keeps loading (and warming up) in the background, so startup takes
+        about as long as the slowest model on the English path.
+        """
+        started = time.time()
+        print(f"🔄 Loading models in parallel ({self.asr_engine_name} ASR engine)...")
+
+        # Fast model for English (whisper-tiny), model for other languages (whisper-medium)
+        self.asr_engine_en = create_asr_engine("tiny", engine=self.asr_engine_name, quantization=self.quantization)
+        self.asr_engine_other = create_asr_engine("medium", engine=self.asr_engine_name, quantization=self.quantization)
+        self.asr_engine_other.warm_up_language = 'hi'
+        for engine in (self.asr_engine_en, self.asr_engine_other):
+            engine.warm_up_max_length = self.asr_max_length
+        self.translator = NLLBTranslator(quantization=self.quantization)
+        self.tts = create_tts_engine(self.tts_engine_name)
+
+        loader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="model-load")
+        for engine in (self.asr_engine_en, self.asr_engine_other):
+            if engine.model_name in self.preload_models:
+                self.load_futures[engine.model_name] = loader.submit(self._load_asr_engine, engine)
+            else:
+                print(f"💤 {engine.model_name} will load on first use")
+        self.load_futures['nllb-200-distilled-600M'] = loader.submit(self._load_translator)
+        self.load_futures[f"tts-{self.tts.name}"] = loader.submit(self.tts.load)
+        loader.shutdown(wait=False)
+        self._start_idle_unloader()
+
+        english_path = [
+            future for name, future in self.load_futures.items() if name != self.asr_engine_other.model_name
+        ]
+        wait(english_path)
+        for future in english_path:
+            # Anything the English path needs must have loaded
+            future.result()
+
+        print(f"✅ Models for English ready in {time.time() - started:.1f}s")
+        medium = self.load_futures.get(self.asr_engine_other.model_name)
+        if medium is not None and not medium.done():
+            print(f"⏳ {self.asr_engine_other.model_name} still loading in the background")
+
+    def _load_asr_engine(self, engine):
+        try:
+            with engine.in_use():
+                self.model_precision[engine.model_name] = engine.precision
+        except Exception as e:
+            self.load_errors[engine.model_name] = str(e)
+            print(f"❌ Failed to load {engine.model_name}: {e}")
+            raise
+
+    def _load_translator(self):
         self.translator.load_models()
+        self.model_precision['nllb-200-distilled-600M'] = self.translator.precision
+
+    def model_status(self):
+        """Per-model load/warm/precision state, for health checks"""
+        status = {}
+        for engine in (self.asr_engine_en, self.asr_engine_other):
+            status[engine.model_name] = {
+                'loaded': engine.loaded,
+                'warm': engine.warm_up_s is not None,
+                'warm_up_s': engine.warm_up_s,
+                'precision': engine.precision if engine.loaded else None,
+                'lazy': engine.model_name not in self.preload_models,
+            }
+
+        nllb = self.translator.engine
+        status['nllb-200-distilled-600M'] = {
+            'loaded': nllb is not None and nllb.model is not None,
+            'warm': nllb is not None and nllb.warm_up_s is not None,
+            'warm_up_s': nllb.warm_up_s if nllb is not None else None,
+            'precision': self.translator.precision,
+            'lazy': False,
+        }
 
-        self.tts = GoogleTTSWrapper()
-        print("✅ All models initialized")
+        tts_name = f"tts-{self.tts.name}"
+        tts_future = self.load_futures.get(tts_name)
+        tts_loaded = tts_future is not None and tts_future.done() and tts_future.exception() is None
+        status[tts_name] = {
+            # Nothing to warm for gTTS; MMS voices warm as they load
+            'loaded': tts_loaded,
+            'warm': tts_loaded,
+            'warm_up_s': self.warm_up_times.get(tts_name),
+            'precision': None,
+            'lazy': False,
+        }
 
-    def speech_to_text(self, audio_data):
-        try:
-            # Select the appropriate model based on current language
-            if self.source_lang.lower() == 'hindi':
-                processor = self.asr_processor_other
-                model = self.asr_model_other
-                forced_language = 'hi'
-                forced_task = "transcribe"
-                model_type = "medium"
-            elif self.source_lang.lower() == 'english':
-                processor = self.asr_processor_en
-                model = self.asr_model_en
-                forced_language = 'en'
-                forced_task = "transcribe"
-                model_type = "tiny"
-            else:
-                # ✅ FIX: FORCE LANGUAGE FOR OTHER INDIAN LANGUAGES
-                processor = self.asr_processor_other
-                model = self.asr_model_other
-                # Map language names to Whisper language codes
-                lang_map = {
-                    'bengali': 'bn', 'tamil': 'ta', 'telugu': 'te', 'marathi': 'mr',
-                    'gujarati': 'gu', 'kannada': 'kn', 'malayalam': 'ml', 'punjabi': 'pa',
-                    'odia': 'or', 'assamese': 'as', 'urdu': 'ur'
-                }
-                forced_language = lang_map.get(self.source_lang.lower(), 'en')
-                forced_task = "transcribe"
-                model_type = "medium"
-            
-            # Update the main attributes for any code that might access them
-            self.asr_processor = processor
-            self.asr_model = model
-            
-            inputs = processor(
-                audio_data, 
-                sampling_rate=self.sample_rate, 
-                return_tensors="pt"
+        for name, info in status.items():
+            info['quantized'] = str(info['precision']).startswith("int8")
+            future = self.load_futures.get(name)
+            if future is not None and future.done() and future.exception() is not None:
+                info['error'] = str(future.exception())
+            elif name in self.load_errors:
+                info['error'] = self.load_errors[name]
+        return status
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until background model loads (e.g. a preloaded whisper-medium) finish"""
+        wait(list(self.load_futures.values()), timeout=timeout)
+
+    def is_ready(self, source_lang='english'):
+        """True when a request in source_lang would not wait for a model that is still loading"""
+        engine, _, _ = self._select_asr_engine(source_lang)
+        future = self.load_futures.get(engine.model_name)
+        if future is not None and not future.done():
+            return False
+        return all(
+            future.done() and future.exception() is None
+            for name, future in self.load_futures.items() if not name.startswith("whisper-")
+        )
+
+    @staticmethod
+    def _parse_model_list(spec):
+        """'all', 'none' or a comma list such as 'whisper-tiny,medium' -> set of model names"""
+        names = {name.strip().lower() for name in spec.split(",") if name.strip()}
+        if "all" in names:
+            return {"whisper-tiny", "whisper-medium"}
+        return {name if name.startswith("whisper-") else f"whisper-{name}" for name in names if name != "none"}
+
+    def _start_idle_unloader(self):
+        """Background thread that frees Whisper models nobody has used for idle_unload_s"""
+        if self.idle_unload_s <= 0 or self._idle_thread is not None:
+            return
+
+        def unload_idle():
+            while True:
+                time.sleep(min(60.0, self.idle_unload_s / 4))
+                for engine in (self.asr_engine_en, self.asr_engine_other):
+                    if engine.model_name in self.preload_models:
+                        continue
+                    if engine.unload_if_idle(self.idle_unload_s):
+                        print(f"💤 Unloaded {engine.model_name} after {self.idle_unload_s:.0f}s idle")
+
+        self._idle_thread = threading.Thread(target=unload_idle, name="asr-idle-unloader", daemon=True)
+        self._idle_thread.start()
+
+    def restart_after_fork(self):
+        """Restart background threads in a forked worker; fork only copies the calling thread"""
+        self._idle_thread = None
+        self._start_idle_unloader()
+
+    def _select_asr_engine(self, source_lang):
+        """Pick (engine, whisper language code, model type) for a source language"""
+        source_lang = source_lang.lower()
+        if source_lang == 'english':
+            # Fast model for English
+            return self.asr_engine_en, 'en', "tiny"
+        # ✅ FIX: FORCE LANGUAGE FOR OTHER INDIAN LANGUAGES
+        forced_language = self.whisper_lang_map.get(source_lang, 'en')
+        return self.asr_engine_other, forced_language, "medium"
+
+    def _split_windows(self, audio_data):
+        """Split audio into overlapping windows Whisper can decode in one pass"""
+        window = int(self.chunk_length_s * self.sample_rate)
+        step = window - int(self.chunk_overlap_s * self.sample_rate)
+        if len(audio_data) <= window:
+            return [audio_data]
+
+        windows = []
+        for start in range(0, len(audio_data), step):
+            windows.append(audio_data[start:start + window])
+            if start + window >= len(audio_data):
+                break
+        return windows
+
+    def _build_windows(self, audio_data, segments):
+        """Pack speech segments into <=30 s windows.
+
+        Returns (window_audio, continues_previous) pairs; continues_previous is
+        True when the window overlaps the one before it and needs stitching.
+        """
+        max_len = int(self.chunk_length_s * self.sample_rate)
+        windows = []
+        pending = []
+        pending_len = 0
+
+        def flush():
+            if pending:
+                windows.append((np.concatenate(pending), False))
+                pending.clear()
+
+        for start, end in segments:
+            segment = audio_data[start:end]
+            if len(segment) > max_len:
+                flush()
+                pending_len = 0
+                for i, piece in enumerate(self._split_windows(segment)):
+                    windows.append((piece, i > 0))
+                continue
+            if pending_len + len(segment) > max_len:
+                flush()
+                pending_len = 0
+            pending.append(segment)
+            pending_len += len(segment)
+        flush()
+        return windows
+
+    def _split_region(self, audio, final):
+        """Pick the speech segments to decode now from a streamed region.
+
+        Returns (segments, carry_from, carry_continues): audio from carry_from on
+        is kept for the next region, and carry_continues marks that it overlaps
+        what was just decoded.
+        """
+        if self.use_vad and self.vad is not None:
+            segments = self.vad.get_speech_segments(audio)
+            if final or not segments or segments[-1][1] < len(audio):
+                return segments, len(audio), False
+            if segments[-1][0] > 0:
+                # Speech runs into the region end: decode it with the next region
+                return segments[:-1], segments[-1][0], False
+        else:
+            segments = [(0, len(audio))]
+            if final:
+                return segments, len(audio), False
+
+        # Uninterrupted speech: decode it all and re-decode the overlap next time
+        overlap = int(self.chunk_overlap_s * self.sample_rate)
+        return segments, max(0, len(audio) - overlap), True
+
+    @staticmethod
+    def _transcribe_batch(key, windows):
+        engine, language, max_length = key
+        return engine.transcribe(windows, language, max_length=max_length)
+
+    def _decode_region(self, engine, language, audio, final, continues_previous):
+        """Decode one region of streamed audio.
+
+        Returns ([(text, continues_previous), ...], leftover audio,
+        leftover continues flag, decoded speech samples, window count).
+        """
+        segments, carry_from, carry_continues = self._split_region(audio, final)
+
+        # Long-form mode: overlapping 30 s windows, decoded in batches
+        windows = self._build_windows(audio, segments)
+        if windows and continues_previous and segments[0][0] == 0:
+            windows[0] = (windows[0][0], True)
+
+        texts = []
+        for i in range(0, len(windows), self.asr_batch_size):
+            batch = [window for window, _ in windows[i:i + self.asr_batch_size]]
+            texts.extend(self.asr_scheduler.submit((engine, language, self.asr_max_length), batch))
+
+        speech = sum(end - start for start, end in segments)
+        pieces = [(text, continues) for text, (_, continues) in zip(texts, windows)]
+        return pieces, audio[carry_from:], carry_continues, speech, len(windows)
+
+    def iter_transcribe(self, audio_chunks, source_lang, stats=None):
+        """Transcribe audio as it arrives, yielding new transcript text per decoded window.
+
+        audio_chunks is any iterable of 16 kHz float32 arrays (a whole clip in
+        one chunk, or a live stream such as audio_io.FFmpegAudioStream).
+        Safe to call from several sessions at once: nothing on self is changed;
+        pass a dict as stats to get this call's VAD numbers.
+        """
+        # Select the appropriate model based on the requested language
+        engine, forced_language, model_type = self._select_asr_engine(source_lang)
+        # Loads the model if needed and keeps it from being unloaded mid-request
+        with engine.in_use():
+            self.model_precision[engine.model_name] = engine.precision
+            yield from self._transcribe_stream(engine, forced_language, model_type, source_lang, audio_chunks, stats)
+
+    def _transcribe_stream(self, engine, forced_language, model_type, source_lang, audio_chunks, stats):
+        """Body of iter_transcribe, run while the engine is held"""
+        region = int(self.stream_region_s * self.sample_rate)
+        pending = np.zeros(0, dtype=np.float32)
+        continues = False
+        tail = ""
+        total = speech = n_windows = 0
+
+        def decode(audio, final):
+            nonlocal continues, tail, speech, n_windows
+            pieces, leftover, continues, decoded, count = self._decode_region(
+                engine, forced_language, audio, final, continues
             )
-            
-            with torch.no_grad():
-                if forced_language:
-                    # ✅ NOW ALL LANGUAGES GET FORCED LANGUAGE
-                    generated_ids = model.generate(
-                        inputs.input_features,
-                        language=forced_language,  # This forces the correct script output
-                        task=forced_task,
-                        max_length=100,
-                        num_beams=3,
-                        temperature=0.0,
-                    )
-                else:
-                    # This case should never happen now since all languages have forced_language
-                    generated_ids = model.generate(
-                        inputs.input_features,
-                        task=forced_task,
-                        max_length=100,
-                        num_beams=3,
-                        temperature=0.0,
-                    )
-            
-            transcription = processor.batch_decode(
-                generated_ids, 
-                skip_special_tokens=True
-            )[0]
-            
-            print(f"🔊 ASR Result [{self.source_lang}, model:{model_type}]: {transcription}")
+            speech += decoded
+            n_windows += count
+            new_texts = []
+            for text, continues_previous in pieces:
+                if continues_previous:
+                    text = drop_overlapping_words(tail, text)
+                if text:
+                    tail = " ".join(f"{tail} {text}".split()[-60:])
+                    new_texts.append(text)
+            return new_texts, leftover
+
+        for chunk in audio_chunks:
+            total += len(chunk)
+            pending = np.concatenate([pending, chunk]) if len(pending) else np.asarray(chunk, dtype=np.float32)
+            while len(pending) >= region:
+                new_texts, leftover = decode(pending[:region], final=False)
+                pending = np.concatenate([leftover, pending[region:]])
+                yield from new_texts
+
+        if len(pending):
+            new_texts, _ = decode(pending, final=True)
+            yield from new_texts
+
+        if self.use_vad and self.vad is not None:
+            skipped = max(0, total - speech)
+            vad_stats = {
+                'total_s': total / self.sample_rate,
+                'speech_s': min(speech, total) / self.sample_rate,
+                'skipped_s': skipped / self.sample_rate,
+                'skipped_pct': 100.0 * skipped / total if total else 0.0,
+            }
+            print(
+                f"🔇 VAD skipped {vad_stats['skipped_s']:.1f}s of "
+                f"{vad_stats['total_s']:.1f}s ({vad_stats['skipped_pct']:.0f}% silence)"
+            )
+            if stats is not None:
+                stats.update(vad_stats)
+
+        if n_windows > 1:
+            print(f"🧩 Long-form ASR [{source_lang}, model:{model_type}]: decoded {n_windows} windows")
+
+    def speech_to_text(self, audio_data, source_lang):
+        """Transcribe a whole clip, or an iterable of chunks that is still being decoded"""
+        try:
+            chunks = [audio_data] if isinstance(audio_data, np.ndarray) else audio_data
+            transcription = " ".join(self.iter_transcribe(chunks, source_lang))
+            print(f"🔊 ASR Result [{source_lang}]: {transcription}")
             return transcription.strip()
-            
+
         except Exception as e:
             print(f"❌ ASR Error: {e}")
             return ""
 
-    def translate_and_tts(self, text, target_lang=None):
-        source_lang = self.source_lang
-        target_lang = target_lang or self.target_lang
-
+    def translate_and_tts(self, text, source_lang, target_lang):
         translated_text = self.translator.translate_text(text, source_lang, target_lang)
         tts_file = self.tts.text_to_speech(translated_text, target_lang)
 
@@ -0,0 +1,161 @@
+import queue
+import threading
+from segmentation import split_sentences
+
+_DONE = object()
+
+# Sentence-final characters of every supported script
+_TERMINATORS = ".!?…।॥۔؟。！？"
+
+
+# -------------------- STREAMING PIPELINE --------------------
+class TranslationPipeline:
+    """Segment-level ASR → translation → TTS pipeline.
+
+    Each stage runs on its own worker thread and hands work to the next one
+    through a bounded queue, so the first translated sentence is spoken while
+    later audio is still being transcribed. Iterating run() yields events:
+
+        ('transcript', text)        new ASR text
+        ('translation', text)       one translated sentence
+        ('audio', (sr, ndarray))    speech for that sentence
+    """
+
+    def __init__(self, translator, source_lang, target_lang, queue_size=4, max_held_windows=3):
+        self.translator = translator
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.queue_size = queue_size
+        # Unpunctuated speech is translated anyway after this many ASR windows
+        self.max_held_windows = max_held_windows
+        self.vad_stats = {}  # filled in by the ASR stage for this run only
+        self._stop = threading.Event()
+        self._errors = []
+
+    def cancel(self):
+        """Stop every stage; run() then ends early without raising"""
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    # ---- queue helpers ----
+    def _put(self, q, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _worker(self, target, *args):
+        def run():
+            try:
+                target(*args)
+            except Exception as e:
+                self._errors.append(e)
+                self._stop.set()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    # ---- stages ----
+    def _asr_stage(self, audio_chunks, text_q, events_q):
+        try:
+            for text in self.translator.iter_transcribe(audio_chunks, self.source_lang, stats=self.vad_stats):
+                if self._stop.is_set():
+                    return
+                self._put(events_q, ('transcript', text))
+                self._put(text_q, text)
+        finally:
+            self._put(text_q, _DONE)
+
+    def _translation_stage(self, text_q, sentence_q, events_q):
+        nllb = self.translator.translator
+        held = ""  # trailing words of an unfinished sentence
+        held_windows = 0  # ASR windows those words have been held for
+        try:
+            while True:
+                text = self._get(text_q)
+                final = text is _DONE
+                if not final:
+                    held = f"{held} {text}".strip()
+
+                sentences = split_sentences(held)
+                # The last sentence may continue in the next ASR window, unless it has
+                # been held too long or no longer fits in one translation request
+                if (
+                    not final and sentences and sentences[-1][-1] not in _TERMINATORS
+                    and held_windows < self.max_held_windows
+                    and nllb.engine.count_tokens(sentences[-1]) <= nllb.max_input_tokens
+                ):
+                    held = sentences.pop()
+                    # A tail that follows finished sentences starts counting afresh
+                    held_windows = held_windows + 1 if not sentences else 1
+                else:
+                    held = ""
+                    held_windows = 0
+
+                pieces = [piece for sentence in sentences for piece in nllb.segment(sentence)]
+                if pieces:
+                    for translated in nllb.translate_batch(pieces, self.source_lang, self.target_lang):
+                        self._put(events_q, ('translation', translated))
+                        self._put(sentence_q, translated)
+
+                if final or self._stop.is_set():
+                    return
+        finally:
+            self._put(sentence_q, _DONE)
+
+    def _tts_stage(self, sentence_q, events_q):
+        tts = self.translator.tts
+        try:
+            while True:
+                sentence = self._get(sentence_q)
+                if sentence is _DONE:
+                    return
+                if not sentence.strip():
+                    continue
+                audio = tts.text_to_speech_audio(sentence, self.target_lang)
+                if audio is None:
+                    print("❌ TTS audio not generated properly")
+                    continue
+                self._put(events_q, ('audio', audio))
+        finally:
+            self._put(events_q, _DONE)
+
+    def run(self, audio_chunks):
+        """Start the stage threads and yield their events in order of completion"""
+        text_q = queue.Queue(maxsize=self.queue_size)
+        sentence_q = queue.Queue(maxsize=self.queue_size)
+        events_q = queue.Queue(maxsize=self.queue_size * 4)
+
+        threads = [
+            self._worker(self._asr_stage, audio_chunks, text_q, events_q),
+            self._worker(self._translation_stage, text_q, sentence_q, events_q),
+            self._worker(self._tts_stage, sentence_q, events_q),
+        ]
+        try:
+            while True:
+                event = self._get(events_q)
+                if event is _DONE:
+                    break
+                yield event
+        finally:
+            # Also reached when the consumer stops iterating early
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        if self._errors:
+            raise self._errors[0]
+
@@ -0,0 +1,86 @@
+import importlib.util
+import os
+import time
+import numpy as np
+
+
+# -------------------- QUANTIZATION --------------------
+# "none" keeps fp32 weights, "int8" applies torch dynamic int8 quantization to Linear layers
+QUANTIZATION = os.environ.get("S2ST_QUANTIZATION", "none").lower()
+# Minimum cosine similarity between int8 and fp32 logits on the fixed sample
+QUANTIZATION_MIN_SIMILARITY = float(os.environ.get("S2ST_QUANTIZATION_MIN_SIMILARITY", "0.98"))
+# CTranslate2 engines quantize at load time instead, e.g. "int8", "int8_float32", "float32"
+CT2_COMPUTE_TYPE = os.environ.get("S2ST_CT2_COMPUTE_TYPE", "int8")
+CT2_CPU_THREADS = int(os.environ.get("S2ST_CT2_CPU_THREADS", "0"))
+
+QUANTIZATION_SAMPLE_TEXT = "The train to New Delhi will depart from platform number three at half past ten."
+
+
+# -------------------- MODEL LOADING --------------------
+def pretrained_load_kwargs():
+    """from_pretrained() options for fast, low-memory loading.
+
+    Safetensors checkpoints (preferred by transformers when present) are
+    memory-mapped; low_cpu_mem_usage skips the random init of weights that are
+    overwritten anyway and avoids a second in-memory copy. It needs accelerate.
+    """
+    if importlib.util.find_spec("accelerate") is not None:
+        return {"low_cpu_mem_usage": True}
+    return {}
+
+
+# -------------------- QUALITY SAMPLES --------------------
+def whisper_quality_sample(processor):
+    """Fixed, deterministic ASR inputs used to compare quantized and fp32 outputs"""
+    rng = np.random.default_rng(0)
+    t = np.arange(5 * 16000) / 16000
+    audio = 0.3 * np.sin(2 * np.pi * (200 + 100 * t) * t) + 0.02 * rng.standard_normal(len(t))
+    inputs = processor(audio.astype(np.float32), sampling_rate=16000, return_tensors="pt")
+    decoder_input_ids = processor.tokenizer(QUANTIZATION_SAMPLE_TEXT, return_tensors="pt").input_ids
+    return {'input_features': inputs.input_features, 'decoder_input_ids': decoder_input_ids}
+
+
+def nllb_quality_sample(tokenizer):
+    """Fixed translation inputs used to compare quantized and fp32 outputs"""
+    tokenizer.src_lang = 'eng_Latn'
+    inputs = tokenizer(QUANTIZATION_SAMPLE_TEXT, return_tensors="pt")
+    return {
+        'input_ids': inputs.input_ids,
+        'attention_mask': inputs.attention_mask,
+        'decoder_input_ids': inputs.input_ids,
+    }
+
+
+def quantize_model(model, mode, name, sample_inputs, min_similarity=QUANTIZATION_MIN_SIMILARITY):
+    """Quantize a model for CPU inference, checking quality against fp32 on a fixed sample.
+
+    Returns (model, precision). Falls back to the fp32 model when the quantized
+    logits drift below min_similarity.
+    """
+    if mode in (None, "", "none", "fp32"):
+        return model, "fp32"
+    if mode != "int8":
+        print(f"⚠️ Unknown quantization mode '{mode}', keeping {name} in fp32")
+        return model, "fp32"
+
+    import torch
+
+    start = time.time()
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+
+    with torch.no_grad():
+        reference = model(**sample_inputs).logits.float()
+        candidate = quantized(**sample_inputs).logits.float()
+    similarity = torch.nn.functional.cosine_similarity(reference.flatten(), candidate.flatten(), dim=0).item()
+    agreement = (reference.argmax(-1) == candidate.argmax(-1)).float().mean().item()
+
+    if similarity < min_similarity:
+        print(f"⚠️ {name}: int8 similarity {similarity:.4f} < {min_similarity}, keeping fp32")
+        return model, "fp32"
+
+    print(
+        f"✅ {name}: int8 dynamic quantization "
+        f"(similarity {similarity:.4f}, top-1 agreement {agreement:.0%}, {time.time() - start:.1f}s)"
+    )
+    return quantized, "int8"
@@ -0,0 +1,80 @@
+import re
+
+
+# -------------------- SENTENCE SEGMENTATION --------------------
+# Latin-style terminators only end a sentence when followed by whitespace
+# ("3.5", "e.g." mid-word stay intact). Danda (Devanagari, Bengali, Gurmukhi,
+# Odia, Assamese), double danda, the Urdu full stop and question mark and CJK
+# terminators end a sentence on their own.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|(?<=[।॥۔؟。！？])\s*")
+
+# Clause-level punctuation used when a single sentence is still too long
+_CLAUSE_BOUNDARY = re.compile(r"(?<=[,;:،؛、，])\s+")
+
+# A period after these does not end a sentence
+# (words like "etc." or "p.m." often end a sentence too, so they still split)
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "e.g", "i.e", "fig", "approx"}
+
+
+def _ends_with_abbreviation(sentence):
+    last_word = sentence.rsplit(None, 1)[-1]
+    if not last_word.endswith("."):
+        return False
+    return last_word[:-1].lstrip("(\"'").lower() in _ABBREVIATIONS
+
+
+def split_sentences(text):
+    """Split text into sentences using the terminators of all supported scripts"""
+    sentences = []
+    for s in _SENTENCE_BOUNDARY.split(text):
+        if not s or not s.strip():
+            continue
+        if sentences and _ends_with_abbreviation(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {s.strip()}"
+        else:
+            sentences.append(s.strip())
+    return sentences
+
+
+def _pack(units, max_length, length_fn, joiner=" "):
+    """Greedily join units into pieces whose summed length stays within max_length"""
+    pieces = []
+    current = []
+    current_len = 0
+    for unit in units:
+        unit_len = length_fn(unit)
+        if current and current_len + unit_len > max_length:
+            pieces.append(joiner.join(current))
+            current = []
+            current_len = 0
+        current.append(unit)
+        current_len += unit_len
+    if current:
+        pieces.append(joiner.join(current))
+    return pieces
+
+
+def split_long_sentence(sentence, max_length, length_fn=len):
+    """Break a sentence that exceeds max_length at clause punctuation, then at words"""
+    if length_fn(sentence) <= max_length:
+        return [sentence]
+
+    pieces = []
+    for clause in _pack(_CLAUSE_BOUNDARY.split(sentence), max_length, length_fn):
+        if length_fn(clause) <= max_length:
+            pieces.append(clause)
+        else:
+            pieces.extend(_pack(clause.split(), max_length, length_fn))
+    return pieces
+
+
+def segment_text(text, max_length, length_fn=len):
+    """Sentence-split text so every piece fits within max_length (as measured by length_fn).
+
+    Each sentence stays its own piece, so pieces translate independently as a
+    batch and cache on their own; only an oversized sentence is split further.
+    """
+    pieces = []
+    for sentence in split_sentences(text):
+        pieces.extend(split_long_sentence(sentence, max_length, length_fn))
+    return pieces
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import unicodedata
+import threading
+import time
+
+# SQLite file shared by every worker process on the host; "" disables the disk tier
+TRANSLATION_CACHE_PATH = os.environ.get(
+    "S2ST_TRANSLATION_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "speech_to_speech_translator", "translations.sqlite3"),
+)
+TRANSLATION_CACHE_MAX_BYTES = int(float(os.environ.get("S2ST_TRANSLATION_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+
+def normalize_cache_text(text):
+    """Canonical form of a segment used in cache keys: Unicode NFC with whitespace
+    collapsed. Case is kept because it can change the translation."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+# -------------------- PERSISTENT TRANSLATION CACHE --------------------
+class PersistentTranslationCache:
+    """On-disk translation cache (SQLite, WAL mode) that survives restarts and is
+    shared by every process pointing at the same file. Keyed by (src, tgt, text);
+    least recently used rows are evicted once the stored text exceeds max_bytes.
+    """
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH, max_bytes=TRANSLATION_CACHE_MAX_BYTES, evict_every=64,
+                 touch_interval_s=3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        # A hit only rewrites last_used if it is older than this, so reads of hot
+        # rows do not each take the database write lock; LRU order stays this coarse
+        self.touch_interval_s = touch_interval_s
+        self._writes_since_evict = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect()
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                src_lang TEXT NOT NULL,
+                tgt_lang TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (src_lang, tgt_lang, text)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+
+    def _write_many(self, sql, rows):
+        """Run a write statement for many rows inside a single transaction"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(sql, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get_many(self, src_lang, tgt_lang, texts):
+        """Look up normalized texts, returning {text: translation} for the hits"""
+        if not texts:
+            return {}
+
+        hits = {}
+        stale = []  # hits whose last_used is due for a refresh
+        now = time.time()
+        stale_before = now - self.touch_interval_s
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(texts), 500):
+                batch = texts[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text, translation, last_used FROM translations "
+                    f"WHERE src_lang = ? AND tgt_lang = ? AND text IN ({placeholders})",
+                    [src_lang, tgt_lang, *batch],
+                ).fetchall()
+                for text, translation, last_used in rows:
+                    hits[text] = translation
+                    if last_used < stale_before:
+                        stale.append(text)
+
+            if stale:
+                self._write_many(
+                    "UPDATE translations SET last_used = ? WHERE src_lang = ? AND tgt_lang = ? AND text = ?",
+                    [(now, src_lang, tgt_lang, text) for text in stale],
+                )
+        return hits
+
+    def put_many(self, src_lang, tgt_lang, items):
+        """Store (normalized text, translation) pairs"""
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._write_many(
+                "INSERT OR REPLACE INTO translations (src_lang, tgt_lang, text, translation, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (src_lang, tgt_lang, text, translation,
+                     len(text.encode("utf-8")) + len(translation.encode("utf-8")), now)
+                    for text, translation in items
+                ],
+            )
+            self._writes_since_evict += len(items)
+            if self._writes_since_evict >= self.evict_every:
+                self._writes_since_evict = 0
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used rows until the cache is back under 90% of max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        doomed = []
+        cursor = self._conn.execute("SELECT src_lang, tgt_lang, text, size FROM translations ORDER BY last_used")
+        for src_lang, tgt_lang, text, size in cursor:
+            if total <= target:
+                break
+            doomed.append((src_lang, tgt_lang, text))
+            total -= size
+        cursor.close()
+
+        self._write_many(
+            "DELETE FROM translations WHERE src_lang = ? AND tgt_lang = ? AND text = ?", doomed
+        )
+        self.evictions += len(doomed)
+        print(f"🧹 Translation cache evicted {len(doomed)} entries")
+
+    def reopen(self):
+        """Open a fresh connection, e.g. in a forked worker process"""
+        self._lock = threading.Lock()
+        self._connect()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from quantization import (
+    CT2_COMPUTE_TYPE, CT2_CPU_THREADS, QUANTIZATION, nllb_quality_sample, pretrained_load_kwargs, quantize_model
+)
+
+# "transformers" (default) or "ctranslate2"
+TRANSLATION_ENGINE = os.environ.get("S2ST_TRANSLATION_ENGINE", "transformers").lower()
+# Directory holding the CTranslate2-converted NLLB model (converted on first use if missing)
+NLLB_CT2_MODEL_DIR = os.path.expanduser(os.environ.get(
+    "S2ST_NLLB_CT2_MODEL_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "speech_to_speech_translator", "nllb-200-distilled-600M-ct2"),
+))
+# Cross-session batching: segments from concurrent requests for the same language
+# pair are translated together, up to TRANSLATION_MAX_BATCH per generate call
+TRANSLATION_MAX_BATCH = int(os.environ.get("S2ST_TRANSLATION_MAX_BATCH", "16"))
+TRANSLATION_MAX_WAIT_MS = float(os.environ.get("S2ST_TRANSLATION_MAX_WAIT_MS", "30"))
+
+
+# Typical segment lengths (about 10-35 tokens) so warm-up exercises a padded batch
+WARM_UP_SENTENCES = [
+    "Hello, how are you today?",
+    "The train to New Delhi will depart from platform number three at half past ten.",
+    "Please remember to bring your identity card and a copy of the booking confirmation, "
+    "because the staff at the entrance will check both before letting anyone board.",
+]
+
+
+# -------------------- TRANSLATION ENGINE INTERFACE --------------------
+class TranslationEngine:
+    """Backend that translates a batch of strings between two NLLB language codes"""
+
+    name = "base"
+
+    def __init__(self, model_name, max_input_tokens=128, max_output_tokens=256, num_beams=3):
+        self.model_name = model_name
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.num_beams = num_beams
+        self.precision = None
+        self.tokenizer = None
+        self.model = None
+        self.warm_up_s = None
+        # tokenizer.src_lang is shared state: set it and encode under one lock
+        self._tokenizer_lock = threading.Lock()
+
+    def load(self):
+        raise NotImplementedError
+
+    def translate(self, texts, src_code, tgt_code):
+        """Translate a list of strings, returning one translation per input"""
+        raise NotImplementedError
+
+    def warm_up(self, src_code='eng_Latn', tgt_code='hin_Deva'):
+        """Translate a small batch of typical sentences once"""
+        started = time.time()
+        self.translate(WARM_UP_SENTENCES, src_code, tgt_code)
+        self.warm_up_s = time.time() - started
+        return self.warm_up_s
+
+    def count_tokens(self, text):
+        with self._tokenizer_lock:
+            return len(self.tokenizer.tokenize(text))
+
+
+# -------------------- TRANSFORMERS ENGINE --------------------
+class TransformersNLLBEngine(TranslationEngine):
+    name = "transformers"
+
+    def __init__(self, model_name, quantization=QUANTIZATION, **kwargs):
+        super().__init__(model_name, **kwargs)
+        self.quantization = quantization
+
+    def load(self):
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, **pretrained_load_kwargs())
+        self.model.eval()
+        self.model, self.precision = quantize_model(
+            self.model, self.quantization, self.model_name.split("/")[-1], nllb_quality_sample(self.tokenizer)
+        )
+
+    def translate(self, texts, src_code, tgt_code):
+        """Translate a list of strings with one padded generate call"""
+        import torch
+
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_code
+            inputs = self.tokenizer(
+                texts, return_tensors="pt", padding=True, truncation=True, max_length=self.max_input_tokens
+            )
+            forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(tgt_code)
+
+        with torch.no_grad():
+            generated_tokens = self.model.generate(
+                **inputs,
+                forced_bos_token_id=forced_bos_token_id,
+                max_length=self.max_output_tokens,
+                num_beams=self.num_beams,
+                early_stopping=True
+            )
+
+        with self._tokenizer_lock:
+            return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+
+# -------------------- CTRANSLATE2 ENGINE --------------------
+class CTranslate2NLLBEngine(TranslationEngine):
+    """NLLB converted to CTranslate2, int8 on CPU by default"""
+
+    name = "ctranslate2"
+
+    def __init__(self, model_name, model_dir=NLLB_CT2_MODEL_DIR, compute_type=CT2_COMPUTE_TYPE,
+                 cpu_threads=CT2_CPU_THREADS, **kwargs):
+        super().__init__(model_name, **kwargs)
+        self.model_dir = model_dir
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+
+    def load(self):
+        try:
+            import ctranslate2
+        except ImportError as e:
+            raise ImportError("S2ST_TRANSLATION_ENGINE=ctranslate2 requires `pip install ctranslate2`") from e
+        from transformers import AutoTokenizer
+
+        if not os.path.isdir(self.model_dir):
+            self._convert(ctranslate2)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = ctranslate2.Translator(
+            self.model_dir,
+            device="cpu",
+            compute_type=self.compute_type,
+            intra_threads=self.cpu_threads,
+        )
+        self.precision = self.compute_type
+
+    def _convert(self, ctranslate2):
+        """Convert the model into a temporary sibling directory and move it into place,
+        so an interrupted or concurrent conversion never leaves a partial model_dir"""
+        print(f"🔄 Converting {self.model_name} to CTranslate2 ({self.model_dir})...")
+        model_dir = os.path.abspath(self.model_dir)
+        parent = os.path.dirname(model_dir)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(model_dir)}-")
+        try:
+            converter = ctranslate2.converters.TransformersConverter(self.model_name)
+            converter.convert(tmp_dir, quantization=self.compute_type, force=True)
+            try:
+                os.replace(tmp_dir, model_dir)
+            except OSError:
+                # Another process finished its conversion first; keep that one
+                if not os.path.isdir(model_dir):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def translate(self, texts, src_code, tgt_code):
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_code
+            source = [
+                self.tokenizer.convert_ids_to_tokens(
+                    self.tokenizer.encode(text, truncation=True, max_length=self.max_input_tokens)
+                )
+                for text in texts
+            ]
+
+        results = self.model.translate_batch(
+            source,
+            target_prefix=[[tgt_code]] * len(source),
+            beam_size=self.num_beams,
+            max_decoding_length=self.max_output_tokens,
+        )
+
+        translations = []
+        with self._tokenizer_lock:
+            for result in results:
+                # Drop the forced target-language token
+                tokens = result.hypotheses[0][1:]
+                translations.append(
+                    self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True)
+                )
+        return translations
+
+
+def create_translation_engine(model_name, engine=TRANSLATION_ENGINE, quantization=QUANTIZATION, **kwargs):
+    """Build the configured translation engine for an NLLB checkpoint"""
+    if engine == CTranslate2NLLBEngine.name:
+        return CTranslate2NLLBEngine(model_name, **kwargs)
+    if engine != TransformersNLLBEngine.name:
+        print(f"⚠️ Unknown translation engine '{engine}', falling back to transformers")
+    return TransformersNLLBEngine(model_name, quantization=quantization, **kwargs)
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from translation_cache import normalize_cache_text
+
+# Directory of synthesized clips; "" disables the cache
+TTS_CACHE_DIR = os.environ.get(
+    "S2ST_TTS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "speech_to_speech_translator", "tts"),
+)
+TTS_CACHE_MAX_BYTES = int(float(os.environ.get("S2ST_TTS_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+
+# -------------------- TTS AUDIO CACHE --------------------
+class AudioFileCache:
+    """Content-addressed cache of synthesized audio files.
+
+    Files are named by hash(lang, text) and evicted least recently used first
+    once the directory exceeds max_bytes. Hits are handed out as a hard link
+    (or copy) in the temp dir, so callers can delete what they receive without
+    touching the cache.
+    """
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = OrderedDict()  # filename -> size, oldest first
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.startswith(".") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def _key(lang, text):
+        return hashlib.sha256(f"{lang}\x1f{normalize_cache_text(text)}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, lang, text, suffix):
+        """Path of the cached clip (marked as recently used), or None on a miss"""
+        name = self._key(lang, text) + suffix
+        path = os.path.join(self.cache_dir, name)
+        with self._lock:
+            if name not in self._index or not os.path.exists(path):
+                self._index.pop(name, None)
+                self.misses += 1
+                return None
+            self._index.move_to_end(name)
+            self.hits += 1
+            os.utime(path)
+        return path
+
+    def get_bytes(self, lang, text, suffix):
+        """Return the cached clip's bytes, or None on a miss"""
+        path = self._lookup(lang, text, suffix)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            # Evicted by another process in the meantime
+            return None
+
+    def get(self, lang, text, suffix):
+        """Return a private copy of the cached clip, or None on a miss"""
+        path = self._lookup(lang, text, suffix)
+        if path is None:
+            return None
+
+        fd, out_path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        os.unlink(out_path)
+        try:
+            os.link(path, out_path)
+        except OSError:
+            shutil.copyfile(path, out_path)
+        return out_path
+
+    def put(self, lang, text, suffix, src_path):
+        """Store a synthesized file under its content address"""
+        self._store(lang, text, suffix, os.path.getsize(src_path), lambda tmp_path: shutil.copyfile(src_path, tmp_path))
+
+    def put_bytes(self, lang, text, suffix, data):
+        """Store an encoded clip held in memory under its content address"""
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        self._store(lang, text, suffix, len(data), write)
+
+    def _store(self, lang, text, suffix, size, write):
+        name = self._key(lang, text) + suffix
+        path = os.path.join(self.cache_dir, name)
+        if size > self.max_bytes:
+            return
+
+        # Write under a temp name then rename, so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".", suffix=suffix)
+        os.close(fd)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.total_bytes += size - self._index.pop(name, 0)
+            self._index[name] = size
+            while self.total_bytes > self.max_bytes and self._index:
+                old_name, old_size = self._index.popitem(last=False)
+                self.total_bytes -= old_size
+                self.evictions += 1
+                try:
+                    os.unlink(os.path.join(self.cache_dir, old_name))
+                except OSError:
+                    pass
@@ -0,0 +1,235 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import wave
+import numpy as np
+from audio_io import decode_audio_bytes
+from quantization import pretrained_load_kwargs
+from tts_cache import TTS_CACHE_DIR, AudioFileCache
+
+# "gtts" (default, Google TTS over HTTP) or "mms" (local VITS models, no network)
+TTS_ENGINE = os.environ.get("S2ST_TTS_ENGINE", "gtts").lower()
+
+
+# -------------------- TTS ENGINE INTERFACE --------------------
+class TTSEngine:
+    """Backend behind text_to_speech(text, language_name) -> audio file path"""
+
+    name = "base"
+    file_suffix = ".wav"
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR):
+        self.language_map = {
+            'hindi': 'hi', 'english': 'en', 'bengali': 'bn', 'tamil': 'ta',
+            'telugu': 'te', 'marathi': 'mr', 'gujarati': 'gu', 'kannada': 'kn',
+            'malayalam': 'ml', 'punjabi': 'pa', 'odia': 'or', 'assamese': 'as', 'urdu': 'ur'
+        }
+
+        # Repeated phrases are served from disk instead of being synthesized again
+        self.cache = None
+        if cache_dir:
+            try:
+                self.cache = AudioFileCache(cache_dir)
+            except Exception as e:
+                print(f"⚠️ TTS cache disabled: {e}")
+
+    def get_language_code(self, language_name):
+        return self.language_map.get(language_name.lower(), 'hi')
+
+    def load(self):
+        """Load anything the engine needs up front (optional)"""
+
+    def warm_up(self):
+        """Exercise locally loaded models once; returns seconds, or None if there is nothing to warm"""
+        return None
+
+    def synthesize_file(self, text, lang_code):
+        """Synthesize text into a new temp file and return its path"""
+        raise NotImplementedError
+
+    def synthesize_bytes(self, text, lang_code):
+        """Synthesize text into an encoded clip (file_suffix format) held in memory"""
+        path = self.synthesize_file(text, lang_code)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(path)
+
+    def text_to_speech_audio(self, text, language_name):
+        """Speech for text as (sample_rate, float32 mono array), or None on failure.
+
+        Hits are read straight from the cache and misses are synthesized in
+        memory, so no temp file is written and read back either way.
+        """
+        try:
+            lang_code = self.get_language_code(language_name)
+            cache_lang = f"{self.name}:{lang_code}"
+            data = self.cache.get_bytes(cache_lang, text, self.file_suffix) if self.cache is not None else None
+            if data is not None:
+                print("⚡ TTS cache hit")
+            else:
+                data = self.synthesize_bytes(text, lang_code)
+                if self.cache is not None:
+                    try:
+                        self.cache.put_bytes(cache_lang, text, self.file_suffix, data)
+                    except Exception as e:
+                        print(f"⚠️ TTS cache write failed: {e}")
+            return decode_audio_bytes(data)
+        except Exception as e:
+            print(f"❌ {self.name} TTS error: {e}")
+            return None
+
+    def text_to_speech_file(self, text, language_name):
+        try:
+            lang_code = self.get_language_code(language_name)
+            # Engines sound different, so each gets its own cache namespace
+            cache_lang = f"{self.name}:{lang_code}"
+            if self.cache is not None:
+                cached_file = self.cache.get(cache_lang, text, self.file_suffix)
+                if cached_file:
+                    print("⚡ TTS cache hit")
+                    return cached_file
+
+            audio_file = self.synthesize_file(text, lang_code)
+
+            if self.cache is not None:
+                try:
+                    self.cache.put(cache_lang, text, self.file_suffix, audio_file)
+                except Exception as e:
+                    print(f"⚠️ TTS cache write failed: {e}")
+            return audio_file
+        except Exception as e:
+            print(f"❌ {self.name} TTS error: {e}")
+            return None
+
+    def text_to_speech(self, text, language_name):
+        return self.text_to_speech_file(text, language_name)
+
+
+# -------------------- GOOGLE TTS --------------------
+class GoogleTTSWrapper(TTSEngine):
+    name = "gtts"
+    file_suffix = ".mp3"
+
+    def synthesize_bytes(self, text, lang_code):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang_code, slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def synthesize_file(self, text, lang_code):
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang=lang_code, slow=False)
+        tmp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
+        tts.save(tmp_file.name)
+        return tmp_file.name
+
+
+# -------------------- LOCAL MMS-TTS --------------------
+class LocalMMSTTSEngine(TTSEngine):
+    """Offline CPU TTS using Meta's MMS-TTS (VITS) checkpoints, one per language.
+
+    Models load on first use of a language; output is PCM produced in-process.
+    """
+
+    name = "mms"
+    file_suffix = ".wav"
+
+    # Whisper/gTTS style codes -> MMS-TTS checkpoint suffixes
+    mms_checkpoints = {
+        'en': 'eng', 'hi': 'hin', 'bn': 'ben', 'ta': 'tam', 'te': 'tel', 'mr': 'mar',
+        'gu': 'guj', 'kn': 'kan', 'ml': 'mal', 'pa': 'pan', 'or': 'ory', 'as': 'asm',
+        'ur': 'urd-script_arabic',
+    }
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, preload_languages=()):
+        super().__init__(cache_dir)
+        self.preload_languages = preload_languages
+        self._models = {}  # lang code -> (tokenizer, model)
+        self._uroman = None  # romanizer, built once (it loads its tables on construction)
+        self._lock = threading.Lock()
+
+    def load(self):
+        for language_name in self.preload_languages:
+            self._get_model(self.get_language_code(language_name))
+
+    def warm_up(self):
+        # Only languages already loaded; the rest load (cold) on first use
+        if not self._models:
+            return None
+        started = time.time()
+        for lang_code in list(self._models):
+            self.synthesize_code("This is a short warm-up sentence.", lang_code)
+        return time.time() - started
+
+    def _get_model(self, lang_code):
+        with self._lock:
+            if lang_code not in self._models:
+                from transformers import AutoTokenizer, VitsModel
+
+                model_name = f"facebook/mms-tts-{self.mms_checkpoints.get(lang_code, 'hin')}"
+                print(f"📥 Loading {model_name}...")
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
+                model = VitsModel.from_pretrained(model_name, **pretrained_load_kwargs())
+                model.eval()
+                self._models[lang_code] = (tokenizer, model)
+            return self._models[lang_code]
+
+    def _romanize(self, text, lang_code):
+        try:
+            import uroman
+        except ImportError as e:
+            raise ImportError(f"MMS-TTS for '{lang_code}' needs romanized input: `pip install uroman`") from e
+        with self._lock:
+            if self._uroman is None:
+                self._uroman = uroman.Uroman()
+        return self._uroman.romanize_string(text)
+
+    def synthesize(self, text, language_name):
+        """Synthesize text in-process, returning (sample_rate, float32 mono array)"""
+        return self.synthesize_code(text, self.get_language_code(language_name))
+
+    def synthesize_code(self, text, lang_code):
+        """Like synthesize(), for a language code such as 'hi'"""
+        import torch
+
+        tokenizer, model = self._get_model(lang_code)
+        if getattr(tokenizer, "is_uroman", False):
+            text = self._romanize(text, lang_code)
+
+        inputs = tokenizer(text, return_tensors="pt")
+        with torch.no_grad():
+            waveform = model(**inputs).waveform[0]
+        return model.config.sampling_rate, waveform.numpy().astype(np.float32)
+
+    def synthesize_bytes(self, text, lang_code):
+        sample_rate, audio = self.synthesize_code(text, lang_code)
+
+        buffer = io.BytesIO()
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    def synthesize_file(self, text, lang_code):
+        data = self.synthesize_bytes(text, lang_code)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
+            tmp_file.write(data)
+        return tmp_file.name
+
+
+def create_tts_engine(engine=TTS_ENGINE, **kwargs):
+    """Build the configured TTS engine"""
+    if engine == LocalMMSTTSEngine.name:
+        return LocalMMSTTSEngine(**kwargs)
+    if engine != GoogleTTSWrapper.name:
+        print(f"⚠️ Unknown TTS engine '{engine}', falling back to gTTS")
+    return GoogleTTSWrapper(**kwargs)
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+# -------------------- VOICE ACTIVITY DETECTION --------------------
+class EnergyVAD:
+    """Lightweight energy + spectral-flatness voice activity detector (NumPy only).
+
+    Any object exposing ``get_speech_segments(audio) -> [(start, end), ...]`` in
+    samples can be plugged into ``LowLatencyTranslator.vad`` instead.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=30, threshold_db=12.0, dynamic_range_db=25.0,
+                 max_flatness=0.45, min_speech_ms=250, min_silence_ms=500, pad_ms=200):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.dynamic_range_db = dynamic_range_db
+        self.max_flatness = max_flatness
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.min_silence_frames = max(1, int(min_silence_ms / frame_ms))
+        self.pad = int(sample_rate * pad_ms / 1000)
+        self.block_frames = 4096
+        self._window = np.hanning(self.frame_len).astype(np.float32)
+
+    def _frame_features(self, audio):
+        """Per-frame energy (dB) and spectral flatness, computed in blocks to bound memory"""
+        n_frames = len(audio) // self.frame_len
+        energy_db = np.empty(n_frames, dtype=np.float32)
+        flatness = np.empty(n_frames, dtype=np.float32)
+
+        for start in range(0, n_frames, self.block_frames):
+            stop = min(start + self.block_frames, n_frames)
+            frames = audio[start * self.frame_len:stop * self.frame_len].astype(np.float32)
+            frames = frames.reshape(stop - start, self.frame_len)
+
+            energy_db[start:stop] = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+            # Noise is spectrally flat, voiced speech is peaky
+            spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1)) + 1e-10
+            flatness[start:stop] = np.exp(np.mean(np.log(spectrum), axis=1)) / np.mean(spectrum, axis=1)
+
+        return energy_db, flatness
+
+    def _speech_frames(self, energy_db, flatness):
+        noise_floor = np.percentile(energy_db, 10)
+        peak = np.percentile(energy_db, 99)
+        # Relative to the noise floor when there is silence to measure, but never
+        # further than dynamic_range_db below the loudest speech
+        threshold = min(noise_floor + self.threshold_db, peak - self.dynamic_range_db)
+        threshold = max(threshold, noise_floor + 3.0)
+
+        loud = energy_db > threshold
+        voiced = loud & (flatness < self.max_flatness)
+        very_loud = energy_db > threshold + self.threshold_db
+        return voiced | very_loud
+
+    def _frames_to_segments(self, is_speech):
+        segments = []
+        start = None
+        for i, speech in enumerate(is_speech):
+            if speech and start is None:
+                start = i
+            elif not speech and start is not None:
+                segments.append([start, i])
+                start = None
+        if start is not None:
+            segments.append([start, len(is_speech)])
+
+        # Bridge short pauses, then drop blips that are too short to be speech
+        merged = []
+        for seg in segments:
+            if merged and seg[0] - merged[-1][1] < self.min_silence_frames:
+                merged[-1][1] = seg[1]
+            else:
+                merged.append(seg)
+        return [seg for seg in merged if seg[1] - seg[0] >= self.min_speech_frames]
+
+    def get_speech_segments(self, audio):
+        """Return voiced regions as a list of (start_sample, end_sample)"""
+        if len(audio) < self.frame_len:
+            return [(0, len(audio))] if len(audio) else []
+
+        energy_db, flatness = self._frame_features(audio)
+        frame_segments = self._frames_to_segments(self._speech_frames(energy_db, flatness))
+
+        segments = []
+        for start_frame, end_frame in frame_segments:
+            start = max(0, start_frame * self.frame_len - self.pad)
+            end = min(len(audio), end_frame * self.frame_len + self.pad)
+            if segments and start <= segments[-1][1]:
+                segments[-1] = (segments[-1][0], end)
+            else:
+                segments.append((start, end))
+        return segments
@@ -0,0 +1,372 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from pipeline import TranslationPipeline
+
+# Number of inference worker processes; 0 keeps everything in the server process
+WORKERS = int(os.environ.get("S2ST_WORKERS", "0"))
+# Torch threads per worker (0 = split the machine's cores evenly between workers)
+WORKER_THREADS = int(os.environ.get("S2ST_WORKER_THREADS", "0"))
+
+# How often the pool checks that its workers are still alive
+WORKER_POLL_S = 1.0
+# Audio is shared in slices of this many 16 kHz samples (30 s, ~1.9 MB), and at most
+# MAX_SHARED_SLICES per job wait in /dev/shm for the worker to copy them out
+SHARED_SLICE_SAMPLES = 30 * 16000
+MAX_SHARED_SLICES = 4
+
+# Models handed to forked workers; they inherit the loaded weights copy-on-write
+_shared_translator = None
+
+
+# -------------------- SHARED-MEMORY AUDIO --------------------
+def _attach(name):
+    try:
+        # Python 3.13+: the creating process owns the segment's lifetime
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+        # Older versions register attached segments too and would unlink them on exit
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def _read_shared_audio(name, length):
+    """Copy a float32 chunk out of a shared-memory segment"""
+    segment = _attach(name)
+    try:
+        return np.ndarray((length,), dtype=np.float32, buffer=segment.buf).copy()
+    finally:
+        segment.close()
+
+
+def _share_audio(chunk):
+    """Place a chunk in a new shared-memory segment; the caller unlinks it"""
+    chunk = np.ascontiguousarray(chunk, dtype=np.float32)
+    segment = shared_memory.SharedMemory(create=True, size=max(1, chunk.nbytes))
+    np.ndarray(chunk.shape, dtype=np.float32, buffer=segment.buf)[:] = chunk
+    return segment
+
+
+# -------------------- WORKER PROCESS --------------------
+class _Inbox:
+    """A worker's job queue. Messages for jobs other than the current one are
+    held back until that job is handled; messages of finished jobs are dropped."""
+
+    def __init__(self, inbox):
+        self.inbox = inbox
+        self.early = deque()
+        self.finished = set()
+
+    def next_for(self, predicate, timeout=None):
+        """Next message matching predicate, or None if none arrives within timeout"""
+        for i, message in enumerate(self.early):
+            if predicate(message):
+                del self.early[i]
+                return message
+        while True:
+            try:
+                message = self.inbox.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if message[0] != 'stop' and message[1] in self.finished:
+                continue
+            if predicate(message):
+                return message
+            self.early.append(message)
+
+
+def _worker_main(worker_id, inbox, outbox, num_threads):
+    import torch
+
+    torch.set_num_threads(num_threads)
+    translator = _shared_translator
+    # SQLite connections must not be shared across fork
+    persistent_cache = translator.translator.persistent_cache
+    if persistent_cache is not None:
+        persistent_cache.reopen()
+    translator.restart_after_fork()
+    print(f"👷 Worker {worker_id} ready (pid {os.getpid()}, {num_threads} threads)")
+
+    jobs = _Inbox(inbox)
+    while True:
+        message = jobs.next_for(lambda m: m[0] in ('job', 'stop'))
+        if message[0] == 'stop':
+            return
+        _, job_id, source_lang, target_lang = message
+        try:
+            _run_job(jobs, outbox, translator, job_id, source_lang, target_lang)
+        finally:
+            jobs.finished.add(job_id)
+            jobs.early = deque(m for m in jobs.early if m[0] == 'stop' or m[1] != job_id)
+
+
+def _run_job(jobs, outbox, translator, job_id, source_lang, target_lang):
+    """Run one job's pipeline on its own thread. This thread keeps reading the
+    inbox meanwhile, so audio keeps flowing in and a cancel is seen at any stage."""
+    pipeline = TranslationPipeline(translator, source_lang, target_lang)
+    chunks = queue.Queue()
+
+    def audio_chunks():
+        while not pipeline.stopped:
+            try:
+                chunk = chunks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                return
+            yield chunk
+
+    def run():
+        try:
+            for kind, value in pipeline.run(audio_chunks()):
+                outbox.put(('event', job_id, (kind, value)))
+            outbox.put(('done', job_id, pipeline.vad_stats))
+        except Exception as e:
+            outbox.put(('error', job_id, f"{type(e).__name__}: {e}"))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    while thread.is_alive():
+        message = jobs.next_for(lambda m: m[0] in ('chunk', 'end', 'cancel') and m[1] == job_id, timeout=0.1)
+        if message is None:
+            continue
+        if message[0] == 'chunk':
+            _, _, name, length = message
+            chunks.put(_read_shared_audio(name, length))
+            # The parent unlinks the segment as soon as it has been copied out
+            outbox.put(('copied', job_id, name))
+        elif message[0] == 'end':
+            chunks.put(None)
+        else:
+            # The requester went away; the pipeline winds down and reports 'done'
+            pipeline.cancel()
+    thread.join()
+
+
+# -------------------- WORKER POOL --------------------
+class _Job:
+    """Parent-side record of a job, kept until its worker reports done or error (or dies)"""
+
+    def __init__(self, worker_id, process):
+        self.worker_id = worker_id
+        self.process = process
+        self.results = queue.Queue()
+        self.segments = {}  # shared-memory segments the worker may still read, by name
+        self.finished = False
+
+
+class WorkerPool:
+    """Run translation jobs in forked worker processes.
+
+    Workers are forked after the models are loaded, so they share the weights
+    copy-on-write and inference runs outside the server process's GIL. Audio
+    reaches a worker as bounded shared-memory slices, each unlinked once the
+    worker has copied it; events come back in the same form
+    TranslationPipeline.run() yields them. A job holds its worker's slot until
+    the worker reports the end of it, even if the requester left early.
+    """
+
+    def __init__(self, translator, num_workers=WORKERS, threads_per_worker=WORKER_THREADS):
+        if "fork" not in mp.get_all_start_methods():
+            raise RuntimeError("worker processes need the 'fork' start method (Linux/macOS)")
+
+        self.num_workers = num_workers
+        self.translator = translator
+        self.threads = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+        self.context = mp.get_context("fork")
+        self.outbox = self.context.Queue()
+        self.inboxes = [None] * num_workers
+        self.processes = [None] * num_workers
+        self.active = [0] * num_workers
+        self._jobs = {}  # job id -> _Job
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)  # a job's segment was copied or its job ended
+        self._closing = False
+
+        for worker_id in range(num_workers):
+            self._spawn(worker_id)
+
+        threading.Thread(target=self._route, daemon=True).start()
+        print(f"✅ Started {num_workers} inference workers")
+
+    def _spawn(self, worker_id):
+        global _shared_translator
+
+        inbox = self.context.Queue()
+        _shared_translator = self.translator
+        try:
+            process = self.context.Process(
+                target=_worker_main, args=(worker_id, inbox, self.outbox, self.threads), daemon=True
+            )
+            process.start()
+        finally:
+            _shared_translator = None
+        self.inboxes[worker_id] = inbox
+        self.processes[worker_id] = process
+
+    def _route(self):
+        last_check = time.monotonic()
+        while True:
+            try:
+                kind, job_id, payload = self.outbox.get(timeout=WORKER_POLL_S)
+            except queue.Empty:
+                kind = None
+            if time.monotonic() - last_check >= WORKER_POLL_S:
+                self._check_workers()
+                last_check = time.monotonic()
+            if kind is None:
+                continue
+
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and kind == 'copied':
+                    self._free_segment(job, payload)
+                    continue
+                if job is not None and kind in ('done', 'error'):
+                    self._finish_job(job_id)
+            if job is not None:
+                job.results.put((kind, payload))
+
+    def _check_workers(self):
+        """Replace workers that died (e.g. OOM-killed) and fail the jobs they had"""
+        failed = []
+        with self._lock:
+            if self._closing:
+                return
+            for worker_id, process in enumerate(self.processes):
+                if process.is_alive():
+                    continue
+                print(f"⚠️ Worker {worker_id} (pid {process.pid}) died with exit code {process.exitcode}, restarting")
+                for job_id, job in list(self._jobs.items()):
+                    if job.process is process:
+                        self._finish_job(job_id)
+                        failed.append((job, f"worker {worker_id} exited with code {process.exitcode}"))
+                self._spawn(worker_id)
+        for job, error in failed:
+            job.results.put(('error', error))
+
+    def _start_job(self, source_lang, target_lang):
+        with self._lock:
+            job_id = next(self._ids)
+            worker_id = min(range(self.num_workers), key=self.active.__getitem__)
+            self.active[worker_id] += 1
+            job = self._jobs[job_id] = _Job(worker_id, self.processes[worker_id])
+            inbox = self.inboxes[worker_id]
+        inbox.put(('job', job_id, source_lang, target_lang))
+        return job_id, job, inbox
+
+    def _share_slice(self, job, audio):
+        """Copy audio into a new segment owned by job, first waiting while MAX_SHARED_SLICES
+        of its segments are still uncopied. Returns None once the job has ended."""
+        with self._freed:
+            while not job.finished and len(job.segments) >= MAX_SHARED_SLICES:
+                self._freed.wait(WORKER_POLL_S)
+            if job.finished:
+                return None
+            segment = _share_audio(audio)
+            job.segments[segment.name] = segment
+            return segment
+
+    def _free_segment(self, job, name):
+        """Unlink one of a job's segments; called with _lock held"""
+        segment = job.segments.pop(name, None)
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+        self._freed.notify_all()
+
+    def _finish_job(self, job_id):
+        """Free a job's worker slot and audio; called with _lock held"""
+        job = self._jobs.pop(job_id)
+        job.finished = True
+        self.active[job.worker_id] -= 1
+        for name in list(job.segments):
+            self._free_segment(job, name)
+        self._freed.notify_all()
+
+    def jobs_queued(self):
+        """Jobs waiting behind the one each worker is running"""
+        with self._lock:
+            return sum(max(0, active - 1) for active in self.active)
+
+    def jobs_in_flight(self):
+        """Jobs currently assigned to workers"""
+        with self._lock:
+            return sum(self.active)
+
+    def pipeline(self, source_lang, target_lang):
+        return WorkerPipeline(self, source_lang, target_lang)
+
+    def close(self):
+        with self._lock:
+            self._closing = True
+        for inbox in self.inboxes:
+            inbox.put(('stop',))
+        for process in self.processes:
+            process.join(timeout=5)
+
+
+class WorkerPipeline:
+    """Drop-in for TranslationPipeline that runs the job in a pool worker"""
+
+    def __init__(self, pool, source_lang, target_lang):
+        self.pool = pool
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.vad_stats = {}
+
+    def run(self, audio_chunks):
+        job_id, job, inbox = self.pool._start_job(self.source_lang, self.target_lang)
+        feed_errors = []
+        stop = threading.Event()
+
+        def feed():
+            # Chunks are forwarded as they arrive, so a still-decoding stream works too;
+            # long ones go in bounded slices so /dev/shm never holds a whole file
+            try:
+                for chunk in audio_chunks:
+                    for start in range(0, len(chunk), SHARED_SLICE_SAMPLES):
+                        if stop.is_set():
+                            return
+                        audio = chunk[start:start + SHARED_SLICE_SAMPLES]
+                        segment = self.pool._share_slice(job, audio)
+                        if segment is None:
+                            return
+                        inbox.put(('chunk', job_id, segment.name, len(audio)))
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                inbox.put(('end', job_id))
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        ended = False
+        try:
+            while True:
+                kind, payload = job.results.get()
+                if kind == 'event':
+                    yield payload
+                elif kind == 'done':
+                    ended = True
+                    self.vad_stats.update(payload or {})
+                    break
+                else:
+                    ended = True
+                    raise RuntimeError(f"worker {job.worker_id} failed: {payload}")
+        finally:
+            stop.set()
+            if not ended:
+                # The consumer stopped early; the worker winds the job down and then frees its slot
+                inbox.put(('cancel', job_id))
+            feeder.join(timeout=5)
+
+        if feed_errors:
+            raise feed_errors[0]